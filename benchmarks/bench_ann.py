@@ -0,0 +1,69 @@
+"""
+Benchmark: recall@k and latency of the ANN prefilter against exact scoring,
+on a synthetic resume corpus.
+
+Run from the repository root:  python benchmarks/bench_ann.py --resumes 100000
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ann import RandomProjectionIndex
+from src.similarity import JobMatcher
+from benchmarks.synthetic import generate_resumes, generate_jobs
+
+# Exact top-k rows by cosine (ties broken by row)
+def exact_top_k(matrix, query, k: int) -> np.ndarray:
+    scores = (matrix @ query.T).toarray()[:, 0]
+    return np.lexsort((np.arange(len(scores)), -scores))[:k]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=50)
+    parser.add_argument('--tables', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--bits', type=int, nargs='+', default=[8, 12, 16])
+    parser.add_argument('--probes', type=int, default=1, choices=[0, 1])
+    parser.add_argument('--max-candidates', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    matcher = JobMatcher(ngram_range=(1, 1))
+    matcher.fit(generate_resumes(args.resumes))
+    queries = matcher.transform_jobs(generate_jobs(args.queries))
+    print(f"Corpus: {args.resumes} resumes, {len(matcher.feature_names)} features "
+          f"(vectorized in {time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    exact = [exact_top_k(matcher.resume_matrix, queries[i], args.k) for i in range(args.queries)]
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+    print("-" * 72)
+    print(f"{'Tables':>6} {'Bits':>5} {'Build (s)':>10} {'Candidates':>11} {'Query (ms)':>11} "
+          f"{'Exact (ms)':>11} {f'Recall@{args.k}':>11}")
+    print("-" * 72)
+    for n_tables in args.tables:
+        for n_bits in args.bits:
+            start = time.perf_counter()
+            index = RandomProjectionIndex(n_tables, n_bits, args.probes).fit(matcher.resume_matrix)
+            build_s = time.perf_counter() - start
+
+            recalls, candidates = [], []
+            start = time.perf_counter()
+            for i in range(args.queries):
+                found = index.search(queries[i], args.k, args.max_candidates)
+                recalls.append(len({row for row, _ in found} & set(exact[i].tolist())) / args.k)
+            query_ms = (time.perf_counter() - start) * 1000 / args.queries
+            for i in range(args.queries):
+                candidates.append(len(index.shortlist(queries[i], args.max_candidates)))
+
+            print(f"{n_tables:>6} {n_bits:>5} {build_s:>10.2f} {np.mean(candidates):>11.0f} "
+                  f"{query_ms:>11.2f} {exact_ms:>11.2f} {np.mean(recalls):>11.3f}")
+
+if __name__ == "__main__":
+    main()
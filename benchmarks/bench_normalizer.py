@@ -0,0 +1,70 @@
+"""
+Micro-benchmark: clean_text and normalize_abbreviations throughput (MB/s)
+against the previous multi-pass regex implementations.
+
+Run from the repository root:  python benchmarks/bench_normalizer.py
+"""
+
+import sys
+import os
+import re
+import glob
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cleaner import clean_text, extract_pdf
+from src.tokenizer import normalize_abbreviations, DEGREE_ABBREVIATIONS
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
+
+# Previous clean_text: five full-text passes
+def legacy_clean_text(text: str, remove_punctuation: bool = True) -> str:
+    text = text.lower()
+    text = re.sub(r"http\S+|www\.\S+", "", text)
+    text = re.sub(r"\S*\d+\S*", "", text)
+    if remove_punctuation:
+        text = re.sub(r"[^\w\s]", " ", text)
+    else:
+        text = re.sub(r"[^\w\s\-']", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+# Previous normalize_abbreviations: one regex pass per dictionary entry
+def legacy_normalize_abbreviations(text: str) -> str:
+    text_lower = text.lower()
+    for abbr, full_form in DEGREE_ABBREVIATIONS.items():
+        pattern = r'\b' + re.escape(abbr) + r'\b'
+        text_lower = re.sub(pattern, full_form, text_lower)
+    return text_lower
+
+# Raw text of the bundled resumes and job descriptions
+def load_corpus() -> str:
+    texts = [extract_pdf(path)['text'] for path in sorted(glob.glob(os.path.join(ASSETS_DIR, 'resumes', '*.pdf')))]
+    for path in sorted(glob.glob(os.path.join(ASSETS_DIR, 'jobs', '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    return '\n'.join(texts)
+
+# Best-of-N throughput in MB/s
+def throughput(func, text: str, number: int = 5, repeat: int = 5) -> float:
+    seconds = min(timeit.repeat(lambda: func(text), number=number, repeat=repeat)) / number
+    return len(text.encode('utf-8')) / seconds / 1e6
+
+def main(scale: int = 20):
+    text = load_corpus() * scale
+    print(f"Corpus: {len(text.encode('utf-8')) / 1e6:.2f} MB")
+    print("-" * 60)
+    print(f"{'Function':<28} {'Before (MB/s)':>14} {'After (MB/s)':>14} {'Speedup':>8}")
+    print("-" * 60)
+
+    cases = [
+        ('clean_text', legacy_clean_text, clean_text),
+        ('normalize_abbreviations', legacy_normalize_abbreviations, normalize_abbreviations),
+    ]
+    for name, before, after in cases:
+        before_mbs = throughput(before, text)
+        after_mbs = throughput(after, text)
+        print(f"{name:<28} {before_mbs:>14.2f} {after_mbs:>14.2f} {after_mbs / before_mbs:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
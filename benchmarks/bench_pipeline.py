@@ -0,0 +1,209 @@
+"""
+Benchmark every pipeline stage on synthetic resumes and job descriptions.
+
+Each stage is timed on its own: throughput (items/s and MB/s of input), p50/p99
+latency per call, and peak Python memory (tracemalloc, measured in a separate pass
+so it does not slow the timing pass). Results are written as JSON, which can be
+compared against a previous run to catch regressions.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py --resumes 200 --output bench.json
+    python benchmarks/bench_pipeline.py --compare bench.json
+
+Stages that need NLTK data which is not installed record an error instead of a result
+(pass --offline to never download it).
+"""
+
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import nltk_resources
+from src.cleaner import clean_text
+from src.tokenizer import (normalize_abbreviations, tokenize, remove_stopwords,
+                           extract_cs_keywords, get_cs_matcher)
+from src.stemmer import stem_with_mapping, clear_stem_cache
+from benchmarks.synthetic import generate_raw_resumes, generate_jobs
+
+# Bump when the JSON layout changes
+BENCH_FORMAT_VERSION = 1
+
+# Size of an input in bytes, for MB/s
+def _input_bytes(item) -> int:
+    if isinstance(item, str):
+        return len(item.encode('utf-8'))
+    if isinstance(item, (list, tuple)):
+        return sum(_input_bytes(x) for x in item)
+    return 0
+
+# Time func over every input (after warmup), then measure peak memory in a second pass
+def run_stage(func: Callable, inputs: List, warmup: int = 1) -> Dict:
+    for item in inputs[:warmup]:
+        func(item)
+
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for item in inputs:
+        func(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    n_bytes = sum(_input_bytes(item) for item in inputs)
+    return {
+        'calls': len(inputs),
+        'input_mb': n_bytes / 1e6,
+        'total_s': total,
+        'calls_per_s': len(inputs) / total if total else None,
+        'mb_per_s': n_bytes / 1e6 / total if total else None,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p99_ms': float(np.percentile(latencies, 99)) * 1000,
+        'peak_mb': peak / 1e6,
+    }
+
+# Stage name -> (function of one input, inputs). Inputs for later stages are
+# produced by earlier ones; if tokenize cannot run, whitespace tokens stand in.
+def build_stages(resumes: List[str], jobs: List[str], repeats: int) -> Dict:
+    # scikit-learn is slow to import; keep it out of module import time
+    from src.tfidf_vectorizer import compute_tfidf, get_all_tfidf_scores
+    from src.similarity import compute_similarity_with_breakdown
+    from main import find_resume_keywords_in_job, analyze_keyword_frequency
+
+    cleaned = [clean_text(normalize_abbreviations(text)) for text in resumes]
+    try:
+        tokens = [tokenize(text) for text in cleaned]
+    except LookupError:
+        tokens = [text.split() for text in cleaned]
+    processed = [' '.join(extract_cs_keywords(doc)) for doc in tokens]
+    corpus = [processed] * repeats
+    keyword_lists = [[(word, 1.0) for word in sorted(set(doc.split()))[:15]] for doc in processed]
+
+    return {
+        'clean_text': (clean_text, resumes),
+        'normalize_abbreviations': (normalize_abbreviations, resumes),
+        'tokenize': (tokenize, cleaned),
+        'remove_stopwords': (lambda doc: remove_stopwords(doc, filter_pos=False), tokens),
+        'remove_stopwords_pos': (lambda doc: remove_stopwords(doc, filter_pos=True), tokens),
+        'remove_stopwords_keyword_first': (
+            lambda doc: remove_stopwords(doc, filter_pos=True, keyword_first=True), tokens),
+        'extract_cs_keywords': (extract_cs_keywords, tokens),
+        'stem_with_mapping': (stem_with_mapping, tokens),
+        'compute_tfidf': (compute_tfidf, corpus),
+        'get_all_tfidf_scores': (get_all_tfidf_scores, corpus),
+        'compute_similarity_with_breakdown': (
+            lambda job: compute_similarity_with_breakdown(processed, job), jobs),
+        'find_resume_keywords_in_job': (
+            lambda job: [find_resume_keywords_in_job(keywords, job) for keywords in keyword_lists], jobs),
+        'analyze_keyword_frequency': (analyze_keyword_frequency, [keyword_lists] * repeats),
+    }
+
+# Run the selected stages; a stage that raises records the error and the rest continue
+def run_benchmarks(n_resumes: int = 200, n_jobs: int = 20, n_words: int = 300,
+                   repeats: int = 3, stages: List[str] = None, seed: int = 0) -> Dict:
+    resumes = generate_raw_resumes(n_resumes, n_words, seed)
+    jobs = generate_jobs(n_jobs, n_words // 2, seed)
+    get_cs_matcher()
+
+    results = {}
+    for name, (func, inputs) in build_stages(resumes, jobs, repeats).items():
+        if stages and name not in stages:
+            continue
+        clear_stem_cache()
+        try:
+            results[name] = run_stage(func, inputs)
+        except LookupError as e:
+            results[name] = {'error': f"missing NLTK data: {str(e).strip().splitlines()[0]}"}
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'format': BENCH_FORMAT_VERSION,
+        'config': {'resumes': n_resumes, 'jobs': n_jobs, 'words': n_words, 'repeats': repeats, 'seed': seed},
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                        'numpy': np.__version__},
+        'stages': results,
+    }
+
+# Per-stage change in throughput and peak memory against a baseline run
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    rows = []
+    for name, result in current['stages'].items():
+        before = baseline['stages'].get(name)
+        if not before or 'error' in before or 'error' in result:
+            continue
+        speed = result['calls_per_s'] / before['calls_per_s'] if before['calls_per_s'] else None
+        memory = result['peak_mb'] / before['peak_mb'] if before['peak_mb'] else None
+        rows.append({
+            'stage': name,
+            'speedup': speed,
+            'memory_ratio': memory,
+            'regression': speed is not None and speed < 1 - threshold,
+        })
+    return rows
+
+# A comparison ratio for printing; None (a zero baseline) has no ratio
+def _format_ratio(ratio) -> str:
+    return f"{ratio:>6.2f}x" if ratio is not None else f"{'n/a':>7}"
+
+def print_results(report: Dict):
+    print("-" * 86)
+    print(f"{'Stage':<36} {'calls/s':>10} {'MB/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'peak MB':>9}")
+    print("-" * 86)
+    for name, result in report['stages'].items():
+        if 'error' in result:
+            print(f"{name:<36} {result['error']}")
+            continue
+        print(f"{name:<36} {result['calls_per_s']:>10.1f} {result['mb_per_s']:>8.2f} "
+              f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['peak_mb']:>9.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--words', type=int, default=300, help="words per synthetic resume")
+    parser.add_argument('--repeats', type=int, default=3, help="calls for corpus-level stages")
+    parser.add_argument('--stage', action='append', dest='stages', help="only run this stage (repeatable)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--offline', action='store_true', help="never download NLTK data")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="JSON from a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        nltk_resources.set_offline()
+
+    report = run_benchmarks(args.resumes, args.jobs, args.words, args.repeats, args.stages, args.seed)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report, args.threshold)
+        print(f"\nCompared with {args.compare}:")
+        for row in rows:
+            flag = "  REGRESSION" if row['regression'] else ""
+            print(f"  {row['stage']:<36} {_format_ratio(row['speedup'])} speed  "
+                  f"{_format_ratio(row['memory_ratio'])} memory{flag}")
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Synthetic resumes and job descriptions built from the CS_KEYWORDS vocabulary.
+
+Each document mixes a few "specialties" (random keyword subsets) with filler words,
+so similarity has real structure for benchmarks such as recall@k.
+"""
+
+import sys
+import os
+import random
+from typing import List
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tokenizer import CS_KEYWORDS, DEGREE_ABBREVIATIONS
+
+FILLER_WORDS = [
+    'team', 'project', 'experience', 'responsible', 'worked', 'built', 'led', 'designed',
+    'company', 'university', 'skills', 'role', 'the', 'and', 'with', 'for', 'using', 'on',
+]
+
+# Random keyword groups that documents draw most of their terms from
+def make_specialties(n_specialties: int = 40, size: int = 25, seed: int = 0) -> List[List[str]]:
+    rng = random.Random(seed)
+    vocabulary = sorted(CS_KEYWORDS)
+    return [rng.sample(vocabulary, min(size, len(vocabulary))) for _ in range(n_specialties)]
+
+# One document: keywords from a couple of specialties plus filler
+def make_document(rng: random.Random, specialties: List[List[str]], n_words: int = 120,
+                  keyword_ratio: float = 0.4) -> str:
+    chosen = rng.sample(specialties, 2)
+    words = []
+    for _ in range(n_words):
+        if rng.random() < keyword_ratio:
+            words.append(rng.choice(chosen[0] if rng.random() < 0.7 else chosen[1]))
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    return ' '.join(words)
+
+# Synthetic resumes as raw text
+def generate_resumes(n_resumes: int, n_words: int = 120, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    specialties = make_specialties(seed=seed)
+    return [make_document(rng, specialties, n_words) for _ in range(n_resumes)]
+
+# Synthetic job descriptions drawn from the same specialties as the resumes
+def generate_jobs(n_jobs: int, n_words: int = 80, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    specialties = make_specialties(seed=seed)
+    return [make_document(rng, specialties, n_words, keyword_ratio=0.6) for _ in range(n_jobs)]
+
+# Make a document look like extracted resume text: URLs, dates, degree abbreviations, punctuation
+def add_noise(rng: random.Random, text: str, noise_ratio: float = 0.1) -> str:
+    abbreviations = sorted(DEGREE_ABBREVIATIONS)
+    noisy = []
+    for word in text.split():
+        roll = rng.random()
+        if roll < noise_ratio / 4:
+            noisy.append(f"https://github.com/{word}")
+        elif roll < noise_ratio / 2:
+            noisy.append(f"{rng.randint(2010, 2024)}-{rng.randint(1, 12):02d}")
+        elif roll < 3 * noise_ratio / 4:
+            noisy.append(rng.choice(abbreviations).upper())
+        elif roll < noise_ratio:
+            noisy.append(word.capitalize() + rng.choice([',', '.', ';', ':', ')']))
+        else:
+            noisy.append(word)
+    return ' '.join(noisy)
+
+# Synthetic resumes as they come out of PDF extraction, before cleaning
+def generate_raw_resumes(n_resumes: int, n_words: int = 120, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 2)
+    return [add_noise(rng, text) for text in generate_resumes(n_resumes, n_words, seed)]
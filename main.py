@@ -1,11 +1,18 @@
 import os
-import re
+import sys
+import argparse
+import numpy as np
+from typing import Dict, Iterator, List
 from src.cleaner import process_document
 from src.tokenizer import tokenize_and_remove_stopwords
-from src.tfidf_vectorizer import get_all_tfidf_scores
-from src.keyword_extractor import extract_top_keywords
-from src.similarity import compute_similarity_with_breakdown, interpret_similarity_score
-from src.utils import list_files_in_directory, load_text_file
+from src.utils import resolve_input_files, load_text_file
+from src.pipeline import iter_processed_documents
+from src.cache import DocumentCache
+from src.keyword_matcher import JobKeywordMatcher, match_keywords_in_jobs
+from src.output import open_writer
+from src.keyword_scores import KeywordScores
+from src.aggregation import KeywordAggregates
+from src import instrumentation
 
 # Process a document and extract keywords
 def process_and_extract_keywords(file_path: str, top_n: int = 15, use_lemmatizer: bool = False):
@@ -18,104 +25,187 @@ def process_and_extract_keywords(file_path: str, top_n: int = 15, use_lemmatizer
     return processed_text
 
 # Find which resume keywords appear in the job description
+# Keywords (single words and phrases alike) must match whole words in the job text
 def find_resume_keywords_in_job(resume_keywords, job_text_raw):
-    job_text_lower = job_text_raw.lower()
-    
-    found = []
-    missing = []
-    
-    for keyword, score in resume_keywords:
-        keyword_lower = keyword.lower()
-        
-        # Check if keyword appears in job text (as whole word or phrase)
-        # Use word boundaries for single words, direct match for phrases
-        if ' ' in keyword_lower:
-            # Multi-word phrase - direct match
-            if keyword_lower in job_text_lower:
-                found.append((keyword, score))
-            else:
-                missing.append((keyword, score))
-        else:
-            # Single word - use word boundary to avoid partial matches
-            pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-            if re.search(pattern, job_text_lower):
-                found.append((keyword, score))
-            else:
-                missing.append((keyword, score))
-    
+    found, missing = match_keywords_in_jobs([resume_keywords], [job_text_raw])[0][0]
     return found, missing
 
 # Analyze keyword frequency across multiple resumes
-def analyze_keyword_frequency(all_keywords_by_resume):
-    from collections import defaultdict
-    
-    keyword_stats = defaultdict(lambda: {'count': 0, 'scores': []})
-    
-    # Aggregate counts and scores
-    for resume_keywords in all_keywords_by_resume:
-        for keyword, score in resume_keywords:
-            keyword_stats[keyword]['count'] += 1
-            keyword_stats[keyword]['scores'].append(score)
-    
-    # Calculate average scores
-    keyword_frequency = {}
-    for keyword, stats in keyword_stats.items():
-        avg_score = sum(stats['scores']) / len(stats['scores'])
-        keyword_frequency[keyword] = {
-            'frequency': stats['count'],
-            'avg_score': avg_score
-        }
-    
-    return keyword_frequency
+# Accepts KeywordScores or per-resume lists of (keyword, score). Statistics are computed
+# with numpy (see src.aggregation) and keywords come back ordered by frequency, then
+# average score
+def analyze_keyword_frequency(all_keywords_by_resume) -> Dict[str, Dict[str, float]]:
+    if isinstance(all_keywords_by_resume, KeywordScores):
+        return KeywordAggregates.from_keyword_scores(all_keywords_by_resume).to_dict()
+    
+    all_keywords_by_resume = list(all_keywords_by_resume)
+    entries = [entry for resume_keywords in all_keywords_by_resume for entry in resume_keywords]
+    keywords = np.array([keyword for keyword, _ in entries], dtype=object)
+    vocabulary, columns = np.unique(keywords, return_inverse=True)
+    scores = [score for _, score in entries]
+    return KeywordAggregates.from_entries(vocabulary.tolist(), columns, scores, len(all_keywords_by_resume)).to_dict()
 
-def main():
-    print("="*80)
-    print("MULTI-RESUME KEYWORD ANALYZER")
-    print("="*80)
-    
-    # Define file paths
-    resume_dir = "assets/resumes"
-    job_dir = "assets/jobs"
-    
-    # Find resume and job files
-    resume_files = list_files_in_directory(resume_dir, '.pdf')
-    if not resume_files:
-        resume_files = list_files_in_directory(resume_dir, '.txt')
-    
-    job_files = list_files_in_directory(job_dir, '.txt')
-    
-    if not resume_files:
-        print(f"\n⚠ No resume files found in {resume_dir}")
-        print("Please add a resume file (PDF or TXT) to the assets/resumes directory.")
+# Pick the job description to analyze: by 1-based number or file name if given,
+# otherwise the only job, otherwise ask (only when attached to a terminal)
+def select_job(job_files: List[str], job: str = None) -> str:
+    if job is not None:
+        if job.isdigit() and 1 <= int(job) <= len(job_files):
+            return job_files[int(job) - 1]
+        for job_file in job_files:
+            if job in (job_file, os.path.basename(job_file)):
+                return job_file
+        print(f"❌ No job description matches {job!r}", file=sys.stderr)
+        return None
+
+    if len(job_files) == 1:
+        return job_files[0]
+
+    if not sys.stdin.isatty():
+        print(f"❌ Found {len(job_files)} job descriptions; choose one with --job or use --all-jobs",
+              file=sys.stderr)
+        return None
+
+    # Interactive job selection if multiple jobs available
+    print(f"\n📋 Found {len(job_files)} job description(s):")
+    for idx, job_file in enumerate(job_files, 1):
+        print(f"  {idx}. {os.path.basename(job_file)}")
+    
+    while True:
+        try:
+            choice = input(f"\nSelect job description (1-{len(job_files)}): ").strip()
+            job_idx = int(choice) - 1
+            if 0 <= job_idx < len(job_files):
+                return job_files[job_idx]
+            else:
+                print(f"❌ Please enter a number between 1 and {len(job_files)}")
+        except ValueError:
+            print("❌ Please enter a valid number")
+        except (KeyboardInterrupt, EOFError):
+            print("\n\n👋 Exiting...")
+            return None
+
+# Score every job against every resume, yielding one row per (job, resume) as each job is done.
+# The resume corpus is processed and fitted once; job descriptions are processed in input
+# order (in parallel when workers > 1) and scored as they arrive.
+def iter_batch_matches(resume_files: List[str], job_files: List[str], workers: int = 1,
+                       cache_dir: str = None, top_keywords: int = 30, top_n: int = 10) -> Iterator[Dict]:
+    from src.tfidf_vectorizer import get_keyword_scores
+    from src.keyword_extractor import extract_top_keyword_scores
+    from src.similarity import JobMatcher, interpret_similarity_score
+
+    cache = DocumentCache(cache_dir) if cache_dir else None
+    processed_resumes = []
+    resume_names = []
+    for result in iter_processed_documents(resume_files, workers=workers, cache=cache):
+        if result['error']:
+            print(f"⚠ Skipped {os.path.basename(result['path'])}: {result['error']}", file=sys.stderr)
+            continue
+        processed_resumes.append(result['processed'])
+        resume_names.append(os.path.basename(result['path']))
+    if not processed_resumes:
+        print("⚠ No resumes could be processed.", file=sys.stderr)
         return
-    
+
+    keyword_scores = get_keyword_scores(processed_resumes, max_features=150, ngram_range=(1, 3), use_stemming=True)
+    top_scores = extract_top_keyword_scores(keyword_scores, top_n=top_keywords)
+    keyword_matcher = JobKeywordMatcher([top_scores.keywords(idx) for idx in range(len(top_scores))])
+    matcher = JobMatcher(ngram_range=(1, 3), max_features=150).fit(processed_resumes)
+
+    for job in iter_processed_documents(job_files, workers=workers, cache=cache):
+        job_name = os.path.basename(job['path'])
+        if job['error']:
+            print(f"⚠ Skipped {job_name}: {job['error']}", file=sys.stderr)
+            continue
+        scores = matcher.score_with_breakdown(job['processed'], top_n=top_n)
+        keyword_matches = keyword_matcher.match(load_text_file(job['path']))
+
+        for resume_name, score, (found, missing) in zip(resume_names, scores, keyword_matches):
+            yield {
+                'job': job_name,
+                'resume': resume_name,
+                'similarity': float(score['similarity']),
+                'match_quality': interpret_similarity_score(score['similarity']),
+                'top_keywords': [keyword for keyword, _, _, _ in score['breakdown']],
+                'found_keywords': [keyword for keyword, _ in found],
+                'missing_keywords': [keyword for keyword, _ in missing],
+            }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare resumes against job descriptions by CS keywords.")
+    parser.add_argument('--resumes', default='assets/resumes',
+                        help="resume directory, file or glob (default: %(default)s)")
+    parser.add_argument('--jobs', default='assets/jobs',
+                        help="job description directory, file or glob (default: %(default)s)")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--job', help="job to analyze, by number or file name")
+    selection.add_argument('--all-jobs', action='store_true',
+                           help="score every job against every resume")
+    parser.add_argument('--format', choices=['text', 'jsonl', 'csv'], default='text',
+                        help="output format (default: %(default)s; text with one job prints the full report)")
+    parser.add_argument('--output', '-o', help="write results to this file instead of stdout")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for document processing (0 = one per CPU)")
+    parser.add_argument('--cache-dir', help="cache processed documents in this directory")
+    parser.add_argument('--profile', action='store_true', help="print per-stage timings to stderr")
+    parser.add_argument('--trace', help="write a Chrome trace-event JSON file")
+    return parser
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    workers = args.workers or None
+
+    resume_files = resolve_input_files(args.resumes)
+    job_files = resolve_input_files(args.jobs, ['.txt'])
+    if not resume_files:
+        print(f"\n⚠ No resume files found in {args.resumes}", file=sys.stderr)
+        print("Please add a resume file (PDF or TXT) or pass --resumes.", file=sys.stderr)
+        return 1
     if not job_files:
-        print(f"\n⚠ No job description files found in {job_dir}")
-        print("Please add a job description file (TXT) to the assets/jobs directory.")
-        return
-    
-    # Interactive job selection if multiple jobs available
-    if len(job_files) > 1:
-        print(f"\n📋 Found {len(job_files)} job description(s):")
-        for idx, job_file in enumerate(job_files, 1):
-            print(f"  {idx}. {os.path.basename(job_file)}")
-        
-        while True:
-            try:
-                choice = input(f"\nSelect job description (1-{len(job_files)}): ").strip()
-                job_idx = int(choice) - 1
-                if 0 <= job_idx < len(job_files):
-                    job_path = job_files[job_idx]
-                    break
-                else:
-                    print(f"❌ Please enter a number between 1 and {len(job_files)}")
-            except ValueError:
-                print("❌ Please enter a valid number")
-            except KeyboardInterrupt:
-                print("\n\n👋 Exiting...")
-                return
+        print(f"\n⚠ No job description files found in {args.jobs}", file=sys.stderr)
+        print("Please add a job description file (TXT) or pass --jobs.", file=sys.stderr)
+        return 1
+
+    if args.all_jobs:
+        selected_jobs = job_files
     else:
-        job_path = job_files[0]
+        job_path = select_job(job_files, args.job)
+        if job_path is None:
+            return 2
+        selected_jobs = [job_path]
+
+    instrumentation.enable(args.profile or bool(args.trace))
+    try:
+        with instrumentation.stage('total'):
+            if args.format == 'text' and not args.all_jobs and not args.output:
+                run_analysis(resume_files, selected_jobs[0], workers, args.cache_dir)
+            else:
+                stream = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+                try:
+                    writer = open_writer(args.format, stream)
+                    for row in iter_batch_matches(resume_files, selected_jobs, workers, args.cache_dir):
+                        writer.write(row)
+                finally:
+                    if args.output:
+                        stream.close()
+    finally:
+        instrumentation.enable(False)
+        if args.profile:
+            print("\n" + instrumentation.format_summary(), file=sys.stderr)
+        if args.trace:
+            instrumentation.write_chrome_trace(args.trace)
+            print(f"Trace written to {args.trace}", file=sys.stderr)
+    return 0
+
+# Full human-readable report for one job description
+def run_analysis(resume_files: List[str], job_path: str, workers: int = 1, cache_dir: str = None):
+    # scikit-learn takes seconds to import, so only load it once there is work to do
+    from src.tfidf_vectorizer import get_keyword_scores
+    from src.keyword_extractor import extract_top_keyword_scores
+    from src.similarity import compute_similarity_with_breakdown, interpret_similarity_score
+    
+    print("="*80)
+    print("MULTI-RESUME KEYWORD ANALYZER")
+    print("="*80)
     
     print(f"\n📁 Found {len(resume_files)} resume(s)")
     print(f"📄 Job Description: {os.path.basename(job_path)}")
@@ -127,26 +217,41 @@ def main():
     
     all_processed_resumes = []
     resume_names = []
+    failed_resumes = []
+    cache = DocumentCache(cache_dir) if cache_dir else None
+    
+    # Results come back in input order even when spread across worker processes
+    for result in iter_processed_documents(resume_files, workers=workers, cache=cache):
+        print(f"\nProcessing: {os.path.basename(result['path'])}{' (cached)' if result['cached'] else ''}")
+        if result['error']:
+            print(f"  ⚠ Skipped: {result['error']}")
+            failed_resumes.append(result['path'])
+            continue
+        all_processed_resumes.append(result['processed'])
+        resume_names.append(os.path.basename(result['path']))
+    
+    if failed_resumes:
+        print(f"\n⚠ {len(failed_resumes)} resume(s) could not be processed")
+    
+    if not all_processed_resumes:
+        print("\n⚠ No resumes could be processed.")
+        return
     
-    for resume_path in resume_files:
-        processed = process_and_extract_keywords(resume_path)
-        all_processed_resumes.append(processed)
-        resume_names.append(os.path.basename(resume_path))
+    resume_files = [f for f in resume_files if f not in failed_resumes]
     
     # Use n-grams to capture multi-word phrases like "machine learning", "data structures"
     # Use stemming to group similar words but return original forms
-    tfidf_scores_all = get_all_tfidf_scores(all_processed_resumes, max_features=150, ngram_range=(1, 3), use_stemming=True)
+    keyword_scores = get_keyword_scores(all_processed_resumes, max_features=150, ngram_range=(1, 3), use_stemming=True)
     
     # Extract keywords from each resume
     print("\n" + "="*80)
     print("STEP 2: EXTRACTING KEYWORDS FROM EACH RESUME")
     print("="*80)
     
-    all_keywords_by_resume = []
-    for idx, scores in enumerate(tfidf_scores_all):
-        keywords = extract_top_keywords(scores, top_n=30)
-        all_keywords_by_resume.append(keywords)
-        print(f"\n{resume_names[idx]}: {len(keywords)} keywords extracted")
+    all_keywords_by_resume = extract_top_keyword_scores(keyword_scores, top_n=30)
+    for idx in range(len(all_keywords_by_resume)):
+        keyword_ids, _ = all_keywords_by_resume.row(idx)
+        print(f"\n{resume_names[idx]}: {len(keyword_ids)} keywords extracted")
     
     # Analyze keyword frequency across resumes
     print("\n" + "="*80)
@@ -155,12 +260,8 @@ def main():
     
     keyword_frequency = analyze_keyword_frequency(all_keywords_by_resume)
     
-    # Sort by frequency, then by average score
-    sorted_keywords = sorted(
-        keyword_frequency.items(),
-        key=lambda x: (x[1]['frequency'], x[1]['avg_score']),
-        reverse=True
-    )
+    # Already sorted by frequency, then by average score
+    sorted_keywords = list(keyword_frequency.items())
     
     print(f"\n🔍 TOP COMPUTER SCIENCE KEYWORDS ACROSS ALL RESUMES:")
     print("-"*80)
@@ -287,4 +388,4 @@ def main():
         print("   Your resumes already cover most job requirements!")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Callable, Dict, Hashable, List, Sequence, Union
+from src.keyword_scores import KeywordScores
+
+DEFAULT_PERCENTILES = (25, 75, 90)
+
+# Per-keyword score statistics across documents, one array entry per feature.
+# Statistics cover the documents a keyword appears in (its non-zero scores), like the
+# avg_score of analyze_keyword_frequency; percentiles interpolate linearly between
+# ranks, as np.percentile does by default.
+# Everything comes from one sort of the (feature, score) entries plus bincount and
+# fancy-indexing reductions, so no per-keyword lists are built.
+class KeywordAggregates:
+    def __init__(self, feature_names: List[str], n_documents: int, frequency: np.ndarray, mean: np.ndarray,
+                 median: np.ndarray, maximum: np.ndarray, percentiles: Dict[int, np.ndarray]):
+        self.feature_names = feature_names
+        self.n_documents = n_documents
+        self.frequency = frequency
+        self.mean = mean
+        self.median = median
+        self.maximum = maximum
+        self.percentiles = percentiles
+
+    # Aggregate flat (feature column, score) entries, one entry per document occurrence
+    @classmethod
+    def from_entries(cls, feature_names: List[str], columns: np.ndarray, scores: np.ndarray, n_documents: int,
+                     percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> 'KeywordAggregates':
+        n_features = len(feature_names)
+        columns = np.asarray(columns, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        # Sort by (column, score) through one integer key: lexsort on a float column is
+        # several times slower at tens of millions of entries
+        ranks = np.empty(len(scores), dtype=np.int64)
+        ranks[np.argsort(scores)] = np.arange(len(scores))
+        order = np.argsort(columns * len(scores) + ranks)
+        columns, scores = columns[order], scores[order]
+
+        # Each feature's scores are now a sorted run starting at starts[feature]
+        frequency = np.bincount(columns, minlength=n_features)
+        starts = np.zeros(n_features + 1, dtype=np.int64)
+        np.cumsum(frequency, out=starts[1:])
+        present = np.flatnonzero(frequency)
+        totals = np.bincount(columns, weights=scores, minlength=n_features)
+        mean = np.divide(totals, frequency, out=np.zeros(n_features), where=frequency > 0)
+
+        def percentile(q: float) -> np.ndarray:
+            position = starts[present] + q / 100 * (frequency[present] - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            result = np.zeros(n_features)
+            result[present] = scores[lower] + (scores[upper] - scores[lower]) * (position - lower)
+            return result
+
+        return cls(feature_names, n_documents, frequency, mean, percentile(50), percentile(100),
+                   {q: percentile(q) for q in percentiles})
+
+    # Aggregate the columns of a TF-IDF matrix (documents x features)
+    @classmethod
+    def from_tfidf(cls, tfidf_matrix, feature_names: List[str],
+                   percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> 'KeywordAggregates':
+        matrix = sp.coo_matrix(tfidf_matrix)
+        positive = matrix.data > 0
+        return cls.from_entries(feature_names, matrix.col[positive], matrix.data[positive], matrix.shape[0], percentiles)
+
+    # Aggregate per-document keyword scores (e.g. each resume's top keywords)
+    @classmethod
+    def from_keyword_scores(cls, keyword_scores: KeywordScores,
+                            percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> 'KeywordAggregates':
+        return cls.from_entries(keyword_scores.vocabulary, keyword_scores.ids, keyword_scores.scores,
+                                len(keyword_scores), percentiles)
+
+    # Features present in any document, by frequency then mean score (descending), then column
+    def rank(self) -> np.ndarray:
+        present = np.flatnonzero(self.frequency)
+        order = np.lexsort((present, -self.mean[present], -self.frequency[present]))
+        return present[order]
+
+    # {keyword: stats} in rank order, optionally only the top keywords
+    def to_dict(self, top: int = None) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for i in self.rank()[:top]:
+            stats = {
+                'frequency': int(self.frequency[i]),
+                'avg_score': float(self.mean[i]),
+                'median_score': float(self.median[i]),
+                'max_score': float(self.maximum[i]),
+            }
+            for q, values in self.percentiles.items():
+                stats[f"p{q}"] = float(values[i])
+            result[self.feature_names[i]] = stats
+        return result
+
+# Aggregate keyword statistics separately for each group of documents. key picks a
+# document's group from its metadata dict: a field name ('team', 'source') or a
+# function (e.g. lambda meta: meta['date'][:7] to group by month).
+# Groups are returned in the order they first appear in metadata.
+def aggregate_by_group(tfidf_matrix, feature_names: List[str], metadata: Sequence[Dict],
+                       key: Union[str, Callable[[Dict], Hashable]],
+                       percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[Hashable, KeywordAggregates]:
+    matrix = sp.coo_matrix(tfidf_matrix)
+    if len(metadata) != matrix.shape[0]:
+        raise ValueError(f"Expected metadata for {matrix.shape[0]} documents, got {len(metadata)}")
+
+    group_ids: Dict[Hashable, int] = {}
+    document_groups = np.array([
+        group_ids.setdefault(key(meta) if callable(key) else meta.get(key), len(group_ids))
+        for meta in metadata
+    ], dtype=np.int64)
+    group_sizes = np.bincount(document_groups, minlength=len(group_ids))
+
+    # Split the matrix entries by group with one stable sort instead of slicing rows
+    positive = matrix.data > 0
+    entry_groups = document_groups[matrix.row[positive]]
+    order = np.argsort(entry_groups, kind='stable')
+    columns, scores = matrix.col[positive][order], matrix.data[positive][order]
+    bounds = np.searchsorted(entry_groups[order], np.arange(len(group_ids) + 1))
+
+    return {
+        label: KeywordAggregates.from_entries(feature_names, columns[bounds[g]:bounds[g + 1]],
+                                              scores[bounds[g]:bounds[g + 1]], int(group_sizes[g]), percentiles)
+        for label, g in group_ids.items()
+    }
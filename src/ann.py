@@ -0,0 +1,89 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Tuple
+
+# Approximate nearest-neighbour prefilter for TF-IDF vectors using random-projection
+# (SimHash) signatures. Each table hashes a vector to n_bits hyperplane signs; resumes
+# sharing a bucket with the job in any table are shortlisted for exact cosine scoring.
+#   n_tables    more tables -> higher recall, more candidates
+#   n_bits      more bits   -> smaller buckets, lower latency, lower recall
+#   probes      also visit buckets whose signature differs in one bit (0 or 1)
+# The projection is a dense (n_features x n_tables * n_bits) float32 matrix.
+class RandomProjectionIndex:
+    def __init__(self, n_tables: int = 8, n_bits: int = 12, probes: int = 1, seed: int = 0):
+        if n_bits > 62:
+            raise ValueError("n_bits must be at most 62")
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.probes = probes
+        self.seed = seed
+        self.matrix = None
+        self.planes = None
+        self.sorted_codes = []
+        self.sorted_rows = []
+
+    # Signature codes (n_vectors x n_tables) for a sparse matrix
+    def _codes(self, matrix) -> np.ndarray:
+        projected = np.asarray(matrix @ self.planes)
+        bits = (projected > 0).reshape(matrix.shape[0], self.n_tables, self.n_bits)
+        powers = np.left_shift(np.int64(1), np.arange(self.n_bits, dtype=np.int64))
+        return (bits * powers).sum(axis=2)
+
+    # Hash every resume vector into the tables
+    def fit(self, tfidf_matrix) -> 'RandomProjectionIndex':
+        self.matrix = sp.csr_matrix(tfidf_matrix)
+        rng = np.random.default_rng(self.seed)
+        self.planes = rng.standard_normal((self.matrix.shape[1], self.n_tables * self.n_bits), dtype=np.float32)
+
+        codes = self._codes(self.matrix)
+        self.sorted_codes = []
+        self.sorted_rows = []
+        for table in range(self.n_tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            self.sorted_codes.append(codes[order, table])
+            self.sorted_rows.append(order)
+        return self
+
+    # Candidate resume rows for a query vector (union of matching buckets across tables)
+    def shortlist(self, query_vector, max_candidates: int = None) -> np.ndarray:
+        if self.matrix is None:
+            raise ValueError("RandomProjectionIndex must be fit before querying")
+        query = sp.csr_matrix(query_vector)
+        codes = self._codes(query)[0]
+
+        flips = [0]
+        if self.probes:
+            flips += [1 << bit for bit in range(self.n_bits)]
+
+        buckets = []
+        for table in range(self.n_tables):
+            sorted_codes = self.sorted_codes[table]
+            for flip in flips:
+                code = codes[table] ^ flip
+                start = np.searchsorted(sorted_codes, code, side='left')
+                end = np.searchsorted(sorted_codes, code, side='right')
+                if end > start:
+                    buckets.append(self.sorted_rows[table][start:end])
+
+        if not buckets:
+            return np.array([], dtype=np.int64)
+        rows, hits = np.unique(np.concatenate(buckets), return_counts=True)
+
+        # Keep the rows that collide most often when the shortlist is capped
+        if max_candidates is not None and len(rows) > max_candidates:
+            keep = np.argsort(-hits, kind='stable')[:max_candidates]
+            rows = np.sort(rows[keep])
+        return rows
+
+    # Approximate top-k as (row, cosine score): exact scores over the shortlist only
+    def search(self, query_vector, k: int = 50, max_candidates: int = None) -> List[Tuple[int, float]]:
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        rows = self.shortlist(query_vector, max_candidates)
+        if len(rows) == 0:
+            return []
+        query = sp.csr_matrix(query_vector)
+        # Rows are L2-normalized, so the dot product is the cosine
+        scores = np.asarray((self.matrix[rows] @ query.T).todense()).ravel()
+        ranking = np.lexsort((rows, -scores))[:k]
+        return [(int(rows[i]), scores[i]) for i in ranking]
@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, List, Tuple
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Bump when the artifact layout changes
+ARTIFACT_FORMAT_VERSION = 1
+
+# A fitted corpus saved as a directory of versions, published through a pointer file:
+#     CURRENT                name of the published version directory
+#     corpus-<id>/meta.json  format version, matrix shape, vectorizer settings
+#                 data.npy   CSR arrays of the TF-IDF matrix (resumes x features)
+#                 indices.npy
+#                 indptr.npy
+#                 idf.npy    IDF vector, one entry per feature
+#                 vocabulary.json    vectorizer terms (stemmed if stemming was used), in column order
+#                 stem_mapping.json  stem -> original word
+#                 ids.json           resume ids, one per row
+# A save writes a complete new version, then replaces CURRENT with os.replace; a load
+# reads CURRENT once and opens every file from that version, so a reader overlapping a
+# save sees either the old corpus or the new one, never a mix.
+# The .npy files are opened with mmap_mode='r', so processes that load the same corpus
+# share its pages through the OS cache instead of each holding a private copy.
+ARRAY_NAMES = ('data', 'indices', 'indptr', 'idf')
+
+# A TfidfVectorizer that uses a given vocabulary (terms in column order) and IDF vector
+# instead of fitting them, so documents vectorized anywhere land in the same space
+def frozen_vectorizer(vocabulary: List[str], idf: np.ndarray,
+                      ngram_range: Tuple[int, int] = (1, 3)) -> TfidfVectorizer:
+    vectorizer = TfidfVectorizer(token_pattern=r'\b\w+\b', ngram_range=tuple(ngram_range))
+    vectorizer.vocabulary_ = {term: column for column, term in enumerate(vocabulary)}
+    vectorizer.idf_ = np.asarray(idf)
+    return vectorizer
+
+class CorpusArtifact:
+    def __init__(self, tfidf_matrix, vocabulary: List[str], idf: np.ndarray,
+                 stem_mapping: Dict[str, str] = None, resume_ids: List[str] = None,
+                 ngram_range: Tuple[int, int] = (1, 3), use_stemming: bool = True):
+        self.tfidf_matrix = tfidf_matrix
+        self.vocabulary = list(vocabulary)
+        self.idf = idf
+        self.stem_mapping = dict(stem_mapping or {})
+        self.resume_ids = list(resume_ids) if resume_ids is not None else [str(i) for i in range(tfidf_matrix.shape[0])]
+        self.ngram_range = tuple(ngram_range)
+        self.use_stemming = use_stemming
+
+    # Collect the artifact from compute_tfidf's return values
+    @classmethod
+    def from_tfidf(cls, tfidf_matrix, vectorizer: TfidfVectorizer, stem_mapping: Dict[str, str] = None,
+                   resume_ids: List[str] = None, use_stemming: bool = True) -> 'CorpusArtifact':
+        return cls(sp.csr_matrix(tfidf_matrix), vectorizer.get_feature_names_out(), vectorizer.idf_,
+                   stem_mapping, resume_ids, vectorizer.ngram_range, use_stemming)
+
+    # Feature names with stems restored, as returned by compute_tfidf
+    @property
+    def feature_names(self) -> List[str]:
+        if not (self.use_stemming and self.stem_mapping):
+            return self.vocabulary
+        return [' '.join(self.stem_mapping.get(word, word) for word in feature.split())
+                for feature in self.vocabulary]
+
+    # A TfidfVectorizer with the saved vocabulary and IDF, ready to transform new documents
+    def build_vectorizer(self) -> TfidfVectorizer:
+        return frozen_vectorizer(self.vocabulary, self.idf, self.ngram_range)
+
+    # Write the artifact as a new version of the corpus in directory and publish it.
+    # The newest keep_versions versions are kept, so readers that resolved CURRENT just
+    # before a save can still open their files.
+    def save(self, directory: str, keep_versions: int = 2):
+        os.makedirs(directory, exist_ok=True)
+        version = tempfile.mkdtemp(dir=directory, prefix='.corpus-')
+        try:
+            matrix = sp.csr_matrix(self.tfidf_matrix)
+            matrix.sort_indices()
+            arrays = {'data': matrix.data, 'indices': matrix.indices, 'indptr': matrix.indptr,
+                      'idf': np.asarray(self.idf, dtype=np.float64)}
+            for name, array in arrays.items():
+                np.save(os.path.join(version, name + '.npy'), array)
+
+            documents = {
+                'meta': {
+                    'format': ARTIFACT_FORMAT_VERSION,
+                    'shape': list(matrix.shape),
+                    'ngram_range': list(self.ngram_range),
+                    'use_stemming': self.use_stemming,
+                },
+                'vocabulary': self.vocabulary,
+                'stem_mapping': self.stem_mapping,
+                'ids': self.resume_ids,
+            }
+            for name, document in documents.items():
+                with open(os.path.join(version, name + '.json'), 'w', encoding='utf-8') as f:
+                    json.dump(document, f)
+
+            # Complete versions are named corpus-<ns timestamp>-<random> (sortable by age)
+            name = f"corpus-{time.time_ns():020d}-{os.path.basename(version)[len('.corpus-'):]}"
+            os.replace(version, os.path.join(directory, name))
+            version = None
+            fd, pointer = tempfile.mkstemp(dir=directory, prefix='.CURRENT-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(name)
+            os.replace(pointer, os.path.join(directory, 'CURRENT'))
+        except BaseException:
+            if version is not None:
+                shutil.rmtree(version, ignore_errors=True)
+            raise
+
+        versions = sorted(entry for entry in os.listdir(directory) if entry.startswith('corpus-'))
+        for old in versions[:-keep_versions] if keep_versions > 0 else []:
+            if old != name:
+                shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+    # Open a saved artifact; with mmap=True the arrays are read-only memory maps
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'CorpusArtifact':
+        with open(os.path.join(directory, 'CURRENT'), 'r', encoding='utf-8') as f:
+            directory = os.path.join(directory, f.read().strip())
+
+        def read_json(name):
+            with open(os.path.join(directory, name + '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        meta = read_json('meta')
+        if meta.get('format') != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus artifact format: {meta.get('format')}")
+
+        arrays = {
+            name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r' if mmap else None)
+            for name in ARRAY_NAMES
+        }
+        # Built directly from the arrays so scipy keeps the memory maps instead of copying
+        matrix = sp.csr_matrix(tuple(meta['shape']), dtype=arrays['data'].dtype)
+        matrix.data, matrix.indices, matrix.indptr = arrays['data'], arrays['indices'], arrays['indptr']
+        matrix.has_sorted_indices = True
+
+        return cls(matrix, read_json('vocabulary'), arrays['idf'], read_json('stem_mapping'),
+                   read_json('ids'), tuple(meta['ngram_range']), meta['use_stemming'])
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+from src.tokenizer import keyword_dictionary_version
+
+# Bump when cached entries change: their layout, or the cleaned text and tokens the
+# pipeline produces for the same file (2: fixed-pass normalization, PDF page cap)
+CACHE_FORMAT_VERSION = 2
+
+# Hash a file's contents without loading it into memory at once
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# On-disk cache of processed documents keyed by content hash and pipeline configuration.
+# Entries are JSON files named "v<format>-<dictionary version>-<key>.json"; entries built
+# with another cache format or keyword dictionary are purged on open and the least
+# recently used entries are evicted once the cache grows past max_bytes.
+# The keyword dictionary is fingerprinted once, when the cache is opened.
+class DocumentCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dictionary_version = keyword_dictionary_version()[:16]
+        self.prefix = f"v{CACHE_FORMAT_VERSION}-{self.dictionary_version}-"
+        os.makedirs(cache_dir, exist_ok=True)
+        self.purge_stale()
+
+    # Build the cache key for a file processed with the given pipeline options
+    def make_key(self, file_path: str, **config) -> str:
+        payload = json.dumps({
+            'format': CACHE_FORMAT_VERSION,
+            'content': hash_file(file_path),
+            'dictionary': self.dictionary_version,
+            'config': config,
+        }, sort_keys=True)
+        return self.prefix + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.json')
+
+    # Load a cached entry, or None if it is missing or unreadable
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Touch the entry so eviction keeps recently used documents
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    # Store an entry atomically so concurrent workers never see partial files
+    def put(self, key: str, entry: Dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # Remove entries produced with a different cache format or keyword dictionary
+    def purge_stale(self) -> int:
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json') and not filename.startswith(self.prefix):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    # Evict least recently used entries until the cache fits in max_bytes
+    def evict(self) -> int:
+        entries = []
+        total = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, filename))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+            total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, filename in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
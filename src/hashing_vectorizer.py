@@ -0,0 +1,130 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Iterable, Iterator, List, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+from src.stemmer import stem_with_mapping
+from src.instrumentation import instrumented
+
+# TF-IDF over hashed n-grams: memory is fixed by n_features instead of growing with the
+# vocabulary. Document frequencies are accumulated chunk by chunk (partial_fit), so the
+# corpus can be streamed. Weights match compute_tfidf (raw counts, smoothed IDF, L2 rows)
+# except where two n-grams share a column.
+# For readable output, the first n-gram seen in each column is remembered (at most one
+# entry per column); feature_names restores stemmed words like compute_tfidf does.
+class HashingTfidfVectorizer:
+    def __init__(self, n_features: int = 2 ** 20, ngram_range: Tuple[int, int] = (1, 3),
+                 use_stemming: bool = True):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.use_stemming = use_stemming
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            token_pattern=r'\b\w+\b',
+            alternate_sign=False,
+            norm=None
+        )
+        self._analyzer = self.hasher.build_analyzer()
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.column_terms: Dict[int, str] = {}
+        self.stem_mapping: Dict[str, str] = {}
+
+    # Stem documents the way compute_tfidf does, remembering readable forms when fitting
+    def _prepare(self, documents: List[str], remember: bool) -> List[str]:
+        if not self.use_stemming:
+            return documents
+        prepared = []
+        for doc in documents:
+            stemmed_tokens, doc_mapping = stem_with_mapping(doc.split())
+            prepared.append(' '.join(stemmed_tokens))
+            if remember:
+                self.stem_mapping.update(doc_mapping)
+        return prepared
+
+    # Column of an n-gram (same hash as HashingVectorizer)
+    def column(self, term: str) -> int:
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    # Accumulate document frequencies (and the reverse lookup) for one chunk of documents
+    def partial_fit(self, documents: List[str]) -> 'HashingTfidfVectorizer':
+        documents = self._prepare(list(documents), remember=True)
+        counts = self.hasher.transform(documents).tocsc()
+        self.document_frequency += np.diff(counts.indptr)
+        self.n_documents += len(documents)
+
+        unseen = set(np.flatnonzero(np.diff(counts.indptr))) - self.column_terms.keys()
+        if unseen:
+            for doc in documents:
+                for term in self._analyzer(doc):
+                    column = self.column(term)
+                    if column in unseen:
+                        self.column_terms[column] = term
+                        unseen.discard(column)
+                if not unseen:
+                    break
+        return self
+
+    # Fit on an iterable of documents, chunk_size documents at a time
+    def fit(self, documents: Iterable[str], chunk_size: int = 1000) -> 'HashingTfidfVectorizer':
+        for chunk in iter_chunks(documents, chunk_size):
+            self.partial_fit(chunk)
+        return self
+
+    # Smoothed IDF, as used by TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+    @property
+    def idf(self) -> np.ndarray:
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+
+    # L2-normalized TF-IDF rows for documents (fitted or not)
+    def transform(self, documents: List[str]):
+        counts = self.hasher.transform(self._prepare(list(documents), remember=False))
+        return normalize(counts @ sp.diags(self.idf), norm='l2').tocsr()
+
+    # Readable name of a column (None if no n-gram has been seen there)
+    def feature_name(self, column: int) -> str:
+        term = self.column_terms.get(int(column))
+        if term is None or not self.use_stemming:
+            return term
+        return ' '.join(self.stem_mapping.get(word, word) for word in term.split())
+
+    @property
+    def feature_names(self) -> 'HashedFeatureNames':
+        return HashedFeatureNames(self)
+
+# Sequence view of a hashing vectorizer's column names, usable wherever code indexes
+# feature_names[column] (get_tfidf_scores, get_similarity_breakdowns, ...)
+class HashedFeatureNames:
+    def __init__(self, vectorizer: HashingTfidfVectorizer):
+        self.vectorizer = vectorizer
+
+    def __len__(self) -> int:
+        return self.vectorizer.n_features
+
+    def __getitem__(self, column: int) -> str:
+        return self.vectorizer.feature_name(column)
+
+# Split an iterable into lists of up to chunk_size items
+def iter_chunks(items: Iterable, chunk_size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# compute_tfidf with hashed features: same return shape (matrix, feature names,
+# vectorizer, stem mapping), with feature names resolved on demand
+@instrumented('tfidf_fit', items=lambda documents, *args, **kwargs: len(documents))
+def compute_hashed_tfidf(documents: List[str], n_features: int = 2 ** 20,
+                         ngram_range: Tuple[int, int] = (1, 3), use_stemming: bool = True,
+                         chunk_size: int = 1000):
+    vectorizer = HashingTfidfVectorizer(n_features, ngram_range, use_stemming)
+    vectorizer.fit(documents, chunk_size)
+    tfidf_matrix = sp.vstack([vectorizer.transform(chunk) for chunk in iter_chunks(documents, chunk_size)]).tocsr() \
+        if documents else sp.csr_matrix((0, n_features))
+    return tfidf_matrix, vectorizer.feature_names, vectorizer, vectorizer.stem_mapping
@@ -0,0 +1,122 @@
+import json
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.stemmer import stem_tokens, get_representative_word
+
+# Bump when the snapshot layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Document-frequency index that can add and remove documents without refitting.
+# It produces the same n-grams, smoothed IDF and L2-normalized weights as
+# compute_tfidf (with max_features=None, min_df=1, max_df=1.0), but IDF is computed
+# per term on demand, so vectorizing one document costs time proportional to that document.
+class IncrementalTfidfIndex:
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 3), use_stemming: bool = True):
+        self.ngram_range = tuple(ngram_range)
+        self.use_stemming = use_stemming
+        self.term_counts: Dict[str, Dict[str, int]] = {}
+        self.document_frequency: Counter = Counter()
+        self.original_forms: Dict[str, Counter] = {}
+        self._analyzer = TfidfVectorizer(
+            token_pattern=r'\b\w+\b',
+            ngram_range=self.ngram_range
+        ).build_analyzer()
+
+    def __len__(self) -> int:
+        return len(self.term_counts)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.term_counts
+
+    # Count a document's n-grams (in stemmed form if stemming is enabled)
+    def _analyze(self, text: str) -> Tuple[Counter, Dict[str, Counter]]:
+        stem_to_original = {}
+        if self.use_stemming:
+            stemmed, stem_to_original = stem_tokens(text.split())
+            text = ' '.join(stemmed)
+        return Counter(self._analyzer(text)), stem_to_original
+
+    # Add a document, replacing any previous version with the same id
+    def add_document(self, doc_id: str, text: str):
+        if doc_id in self.term_counts:
+            self.remove_document(doc_id)
+
+        counts, stem_to_original = self._analyze(text)
+        self.term_counts[doc_id] = dict(counts)
+        self.document_frequency.update(counts.keys())
+        for stem, originals in stem_to_original.items():
+            self.original_forms.setdefault(stem, Counter()).update(originals)
+
+    # Remove a document and its contribution to document frequencies
+    # (original word forms are kept, since they only affect how features are displayed)
+    def remove_document(self, doc_id: str):
+        counts = self.term_counts.pop(doc_id)
+        self.document_frequency.subtract(counts.keys())
+        for term in counts:
+            if self.document_frequency[term] <= 0:
+                del self.document_frequency[term]
+
+    # Smoothed IDF, as used by TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+    def idf(self, term: str) -> float:
+        n_docs = len(self.term_counts)
+        return math.log((1 + n_docs) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    # L2-normalized TF-IDF weights for raw counts
+    def _weights(self, counts: Dict[str, int]) -> Dict[str, float]:
+        weights = {term: count * self.idf(term) for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if norm == 0:
+            return {}
+        return {term: weight / norm for term, weight in weights.items()}
+
+    # TF-IDF weights of an indexed document, keyed by (stemmed) feature
+    def vectorize(self, doc_id: str) -> Dict[str, float]:
+        return self._weights(self.term_counts[doc_id])
+
+    # TF-IDF weights of a text that is not part of the index
+    def vectorize_text(self, text: str) -> Dict[str, float]:
+        counts, _ = self._analyze(text)
+        return self._weights(counts)
+
+    # Turn a stemmed feature back into readable words
+    def restore(self, feature: str) -> str:
+        if not self.use_stemming:
+            return feature
+        return ' '.join(
+            get_representative_word(word, self.original_forms.get(word)) for word in feature.split()
+        )
+
+    # Top keywords of an indexed document, with readable names and highest score first
+    def top_keywords(self, doc_id: str, top_n: int = 10) -> List[Tuple[str, float]]:
+        weights = self.vectorize(doc_id)
+        top = sorted(weights.items(), key=lambda x: (-x[1], x[0]))[:top_n]
+        return [(self.restore(feature), score) for feature, score in top]
+
+    # Save the index to a JSON snapshot
+    def save(self, path: str):
+        snapshot = {
+            'format': INDEX_FORMAT_VERSION,
+            'ngram_range': list(self.ngram_range),
+            'use_stemming': self.use_stemming,
+            'term_counts': self.term_counts,
+            'original_forms': {stem: dict(forms) for stem, forms in self.original_forms.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+
+    # Load an index written by save
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalTfidfIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if snapshot.get('format') != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format: {snapshot.get('format')}")
+
+        index = cls(ngram_range=tuple(snapshot['ngram_range']), use_stemming=snapshot['use_stemming'])
+        index.term_counts = snapshot['term_counts']
+        for counts in index.term_counts.values():
+            index.document_frequency.update(counts.keys())
+        index.original_forms = {stem: Counter(forms) for stem, forms in snapshot['original_forms'].items()}
+        return index
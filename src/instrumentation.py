@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Opt-in per-stage instrumentation. While enabled, every stage() block records one
+# event with its wall time, CPU time, item count and two memory figures:
+#   process_peak_rss_mb  the process's peak RSS so far (ru_maxrss), shared by every
+#                        stage that runs after the process's most expensive one
+#   rss_growth_mb        how much the stage raised that peak, which attributes memory
+#                        to the stage that set a new high-water mark (0 for the others)
+# Events can be summarized as a table or written as Chrome trace-event JSON
+# (open in chrome://tracing or https://ui.perfetto.dev). Disabled, stage() does nothing.
+_enabled = False
+_events: List[Dict] = []
+_lock = threading.Lock()
+
+def enable(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+def is_enabled() -> bool:
+    return _enabled
+
+# Drop all recorded events
+def reset():
+    with _lock:
+        _events.clear()
+
+# Peak resident set size over this process's lifetime in MB (None where unsupported)
+def process_peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+# Record a stage; `items` is the number of documents (or other units) it handled.
+# The yielded dict lets the block set the count once it is known: info['items'] = n
+@contextmanager
+def stage(name: str, items: int = 1):
+    info = {'items': items}
+    if not _enabled:
+        yield info
+        return
+
+    start_wall = time.time()
+    start_peak = process_peak_rss_mb()
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield info
+    finally:
+        peak = process_peak_rss_mb()
+        event = {
+            'name': name,
+            'start': start_wall,
+            'wall': time.perf_counter() - start,
+            'cpu': time.process_time() - start_cpu,
+            'items': info['items'],
+            'process_peak_rss_mb': peak,
+            'rss_growth_mb': peak - start_peak if peak is not None else None,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        with _lock:
+            _events.append(event)
+
+# Decorator form of stage(); `items` may be a function of the call's arguments
+def instrumented(name: str, items=None):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            count = items(*args, **kwargs) if callable(items) else (items or 1)
+            with stage(name, count):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Recorded events, oldest first
+def get_events() -> List[Dict]:
+    with _lock:
+        return list(_events)
+
+# Remove and return recorded events (used to ship worker events back to the parent)
+def drain_events() -> List[Dict]:
+    with _lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+# Add events recorded elsewhere, e.g. in a worker process
+def merge_events(events: List[Dict]):
+    with _lock:
+        _events.extend(events)
+
+# Per-stage totals: calls, items, wall and CPU seconds, the largest growth of the process
+# peak RSS in one call, and the highest process peak seen
+def summarize(events: List[Dict] = None) -> Dict[str, Dict]:
+    events = get_events() if events is None else events
+    summary = {}
+    for event in events:
+        stats = summary.setdefault(event['name'], {
+            'calls': 0, 'items': 0, 'wall': 0.0, 'cpu': 0.0, 'rss_growth_mb': None, 'process_peak_rss_mb': None
+        })
+        stats['calls'] += 1
+        stats['items'] += event['items']
+        stats['wall'] += event['wall']
+        stats['cpu'] += event['cpu']
+        for key in ('rss_growth_mb', 'process_peak_rss_mb'):
+            if event[key] is not None:
+                stats[key] = max(stats[key] or 0, event[key])
+    return summary
+
+# Summary as a printable table, slowest stage first
+def format_summary(events: List[Dict] = None) -> str:
+    summary = summarize(events)
+    lines = [
+        f"{'Stage':<28} {'Calls':>7} {'Items':>7} {'Wall (s)':>10} {'CPU (s)':>10} {'Items/s':>10} "
+        f"{'RSS growth (MB)':>16} {'Process peak (MB)':>18}",
+        "-" * 112,
+    ]
+    for name, stats in sorted(summary.items(), key=lambda x: -x[1]['wall']):
+        rate = stats['items'] / stats['wall'] if stats['wall'] else 0.0
+        growth, peak = (f"{stats[key]:.1f}" if stats[key] is not None else "n/a"
+                        for key in ('rss_growth_mb', 'process_peak_rss_mb'))
+        lines.append(f"{name:<28} {stats['calls']:>7} {stats['items']:>7} {stats['wall']:>10.3f} "
+                     f"{stats['cpu']:>10.3f} {rate:>10.1f} {growth:>16} {peak:>18}")
+    return "\n".join(lines)
+
+# Events as Chrome trace-event JSON ("complete" events, microsecond timestamps)
+def to_chrome_trace(events: List[Dict] = None) -> Dict:
+    events = get_events() if events is None else events
+    return {
+        'traceEvents': [
+            {
+                'name': event['name'],
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['wall'] * 1e6,
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': {'items': event['items'], 'cpu_ms': event['cpu'] * 1000,
+                         'rss_growth_mb': event['rss_growth_mb'],
+                         'process_peak_rss_mb': event['process_peak_rss_mb']},
+            }
+            for event in events
+        ],
+        'displayTimeUnit': 'ms',
+    }
+
+def write_chrome_trace(path: str, events: List[Dict] = None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(to_chrome_trace(events), f)
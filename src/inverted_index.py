@@ -0,0 +1,109 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Tuple
+from src.tfidf_vectorizer import compute_tfidf, transform_documents
+
+# Inverted index from n-gram feature to a posting list of (resume, TF-IDF weight),
+# answering top-k "best resumes for this job" queries without scoring every resume.
+# Rows of compute_tfidf are L2-normalized, so the accumulated dot products are the
+# same cosine scores the dense path computes.
+class InvertedIndex:
+    def __init__(self, tfidf_matrix, resume_ids: List = None):
+        postings = sp.csc_matrix(tfidf_matrix, dtype=np.float64)
+        postings.sum_duplicates()
+        self.n_resumes, self.n_features = postings.shape
+        self.resume_ids = list(resume_ids) if resume_ids is not None else list(range(self.n_resumes))
+
+        # Sort each posting list by weight, highest first
+        columns = np.repeat(np.arange(self.n_features), np.diff(postings.indptr))
+        order = np.lexsort((-postings.data, columns))
+        self.indptr = postings.indptr
+        self.rows = postings.indices[order]
+        self.weights = postings.data[order]
+
+        # Upper bound on any resume's weight for each feature
+        self.max_weights = np.zeros(self.n_features)
+        non_empty = np.diff(self.indptr) > 0
+        self.max_weights[non_empty] = self.weights[self.indptr[:-1][non_empty]]
+
+        self.vectorizer = None
+        self.use_stemming = False
+
+    # Build the index (and keep the fitted vectorizer) straight from resume texts
+    @classmethod
+    def from_documents(cls, resume_texts: List[str], resume_ids: List = None,
+                       ngram_range: Tuple[int, int] = (1, 3), max_features: int = None,
+                       use_stemming: bool = True) -> 'InvertedIndex':
+        tfidf_matrix, _, vectorizer, _ = compute_tfidf(
+            resume_texts,
+            max_features=max_features,
+            ngram_range=ngram_range,
+            use_stemming=use_stemming
+        )
+        index = cls(tfidf_matrix, resume_ids)
+        index.vectorizer = vectorizer
+        index.use_stemming = use_stemming
+        return index
+
+    def _posting(self, feature: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[feature], self.indptr[feature + 1]
+        return self.rows[start:end], self.weights[start:end]
+
+    # Top-k resumes for a query vector, as (resume id, cosine score), highest first.
+    # Term-at-a-time: query terms are visited by decreasing upper bound, and once the
+    # remaining bounds cannot lift an unseen resume past the current k-th best score, no
+    # new candidates are admitted. This bounds the candidate set that is ranked at the
+    # end; every posting of every query term is still read, since the returned scores
+    # are exact and any posting may belong to a top-k resume.
+    # Only resumes sharing at least one feature with the query are returned.
+    def search(self, query_vector, k: int = 50) -> List[Tuple[object, float]]:
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        query = sp.csr_matrix(query_vector, dtype=np.float64)
+        query.sum_duplicates()
+        features, query_weights = query.indices, query.data
+
+        bounds = query_weights * self.max_weights[features]
+        keep = bounds > 0
+        features, query_weights, bounds = features[keep], query_weights[keep], bounds[keep]
+        order = np.argsort(-bounds, kind='stable')
+        features, query_weights, bounds = features[order], query_weights[order], bounds[order]
+        remaining_bounds = np.cumsum(bounds[::-1])[::-1]
+
+        scores = np.zeros(self.n_resumes)
+        candidate = np.zeros(self.n_resumes, dtype=bool)
+        n_candidates = 0
+        accepting = True
+
+        for position, feature in enumerate(features):
+            rows, weights = self._posting(feature)
+            if accepting and n_candidates >= k:
+                candidate_scores = scores[candidate]
+                kth_best = np.partition(candidate_scores, n_candidates - k)[n_candidates - k]
+                accepting = remaining_bounds[position] >= kth_best
+
+            if accepting:
+                scores[rows] += query_weights[position] * weights
+                new = ~candidate[rows]
+                candidate[rows[new]] = True
+                n_candidates += int(new.sum())
+            else:
+                seen = candidate[rows]
+                scores[rows[seen]] += query_weights[position] * weights[seen]
+
+        candidates = np.flatnonzero(candidate)
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            cutoff = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+            tied = candidate_scores >= cutoff
+            candidates, candidate_scores = candidates[tied], candidate_scores[tied]
+        ranking = np.lexsort((candidates, -candidate_scores))[:k]
+
+        return [(self.resume_ids[candidates[i]], candidate_scores[i]) for i in ranking]
+
+    # Top-k resumes for a job description (requires an index built with from_documents)
+    def search_text(self, job_text: str, k: int = 50) -> List[Tuple[object, float]]:
+        if self.vectorizer is None:
+            raise ValueError("search_text needs an index built with InvertedIndex.from_documents")
+        query = transform_documents(self.vectorizer, [job_text], self.use_stemming)
+        return self.search(query, k)
@@ -1,15 +1,102 @@
-from typing import List, Tuple, Dict
+import heapq
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Tuple, Dict, Iterator
+from src.keyword_scores import KeywordScores
 
 # Extract top N keywords based on TF-IDF scores
+# heapq.nlargest keeps an N-item heap instead of sorting every score; like a stable
+# sort, ties keep their order in the dict
 def extract_top_keywords(tfidf_scores: Dict[str, float], top_n: int = 10) -> List[Tuple[str, float]]:
-    sorted_keywords = sorted(tfidf_scores.items(), key=lambda x: x[1], reverse=True)
-    return sorted_keywords[:top_n]
+    return heapq.nlargest(top_n, tfidf_scores.items(), key=lambda x: x[1])
+
+# Top N keywords of every document at once, kept in array form
+def extract_top_keyword_scores(keyword_scores: KeywordScores, top_n: int = 10) -> KeywordScores:
+    return keyword_scores.top_k(top_n)
 
 # Extract keywords from multiple documents
 def extract_keywords_from_multiple_docs(all_tfidf_scores: List[Dict[str, float]], 
                                         top_n: int = 10) -> List[List[Tuple[str, float]]]:
     return [extract_top_keywords(scores, top_n) for scores in all_tfidf_scores]
 
+# Top-k selection over CSR-style rows (row i holds scores[indptr[i]:indptr[i + 1]]).
+# Yields (counts, positions) per block of rows: how many entries each row kept and their
+# positions in scores, each row's highest score first with ties broken by position.
+# A block is padded to a dense (rows x longest row) array and cut with np.partition
+# instead of a full sort; only the kept entries are sorted. Blocks hold at most
+# block_size rows and, past their first row, at most max_entries padded cells, so one
+# long row among short ones gets a block of its own instead of widening its neighbours:
+# a block's array is bounded by max_entries or by its single row's length.
+# Non-positive scores are skipped, like _sparse_row in tfidf_vectorizer.
+def iter_top_k_positions(indptr: np.ndarray, scores: np.ndarray, top_n: int, block_size: int = 256,
+                         max_entries: int = 1 << 20) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    indptr = np.asarray(indptr, dtype=np.int64)
+    scores = np.asarray(scores)
+    row_lengths = np.diff(indptr)
+    first = 0
+    while first < len(row_lengths):
+        # Padded size of the block ending at each row; it only grows, so the rows that
+        # fit the budget are a prefix
+        widest = np.maximum.accumulate(row_lengths[first:first + block_size])
+        n_rows = max(1, int(np.count_nonzero(widest * np.arange(1, len(widest) + 1) <= max_entries)))
+        starts = indptr[first:first + n_rows + 1]
+        first += n_rows
+        lengths = np.diff(starts)
+        width = int(lengths.max(initial=0))
+        offsets = np.arange(width)
+        valid = offsets < lengths[:, None]
+        positions = np.where(valid, starts[:-1, None] + offsets, 0)
+        values = np.where(valid, scores[positions], -np.inf)
+        values[~(values > 0)] = -np.inf
+
+        keep = np.isfinite(values)
+        if top_n <= 0:
+            keep[:] = False
+        elif top_n < width:
+            # k-th largest score per row; everything above it is kept, and entries equal
+            # to it fill the remaining slots in position order
+            kth = -np.partition(-values, top_n - 1, axis=1)[:, top_n - 1:top_n]
+            above = values > kth
+            tied = (values == kth) & np.isfinite(kth)
+            slots = top_n - above.sum(axis=1, keepdims=True)
+            keep &= above | (tied & (np.cumsum(tied, axis=1) <= slots))
+
+        rows, columns = np.nonzero(keep)
+        order = np.lexsort((columns, -values[rows, columns], rows))
+        yield keep.sum(axis=1), positions[rows, columns][order]
+
+# All blocks of iter_top_k_positions joined: (counts per row, positions)
+def top_k_positions(indptr: np.ndarray, scores: np.ndarray, top_n: int, block_size: int = 256,
+                    max_entries: int = 1 << 20) -> Tuple[np.ndarray, np.ndarray]:
+    blocks = list(iter_top_k_positions(indptr, scores, top_n, block_size, max_entries))
+    if not blocks:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    counts, positions = zip(*blocks)
+    return np.concatenate(counts), np.concatenate(positions)
+
+# Yield each document's top N keywords straight from a TF-IDF matrix, block by block, so
+# reporting can start before the whole corpus is ranked. Rows give the same lists as
+# extract_top_keywords on get_tfidf_scores (ties in feature order), except that feature
+# names that repeat are not merged into one entry.
+def iter_top_keywords(tfidf_matrix, feature_names: List[str], top_n: int = 10,
+                      block_size: int = 256) -> Iterator[List[Tuple[str, float]]]:
+    matrix = sp.csr_matrix(tfidf_matrix)
+    if not matrix.has_canonical_format:
+        matrix = matrix.copy()
+        matrix.sum_duplicates()
+    for counts, positions in iter_top_k_positions(matrix.indptr, matrix.data, top_n, block_size):
+        start = 0
+        for count in counts:
+            selected = positions[start:start + count]
+            start += count
+            yield [(feature_names[column], score)
+                   for column, score in zip(matrix.indices[selected], matrix.data[selected])]
+
+# Top N keywords of every document in a TF-IDF matrix
+def extract_top_keywords_from_matrix(tfidf_matrix, feature_names: List[str],
+                                     top_n: int = 10) -> List[List[Tuple[str, float]]]:
+    return list(iter_top_keywords(tfidf_matrix, feature_names, top_n))
+
 # Normalize keyword for comparison (e.g., singularize, lowercase)
 def normalize_keyword_for_comparison(keyword: str) -> str:
     # Convert to lowercase and strip
@@ -0,0 +1,140 @@
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+from src import instrumentation
+
+# Marker key used to flag the end of a keyword inside the trie
+_END = None
+
+# Words with the symbols CS terms use kept inside them: '+' and '#' (c++, c#, f#) and
+# dots between word characters or leading a word (.net, node.js, asp.net). Other
+# punctuation, and a dot that ends a sentence, still separate words.
+_WORD = re.compile(r'(?:\.(?=\w))?\w(?:[\w+#]|\.(?=\w))*')
+
+# Split text into lowercase word tokens
+def word_tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+# The same tokens with dotted ones split into their parts ("node.js" -> "node", "js"),
+# as clean_text splits them when resume keywords are extracted
+def dot_parts(tokens: List[str]) -> List[str]:
+    return [part for token in tokens for part in token.split('.') if part]
+
+# Add a keyword, given as its sequence of words, to a token trie
+def insert_into_trie(trie: Dict, words: List[str], keyword: str):
+    node = trie
+    for word in words:
+        node = node.setdefault(word, {})
+    node.setdefault(_END, []).append(keyword)
+
+# Walk a token trie once over a token stream, returning matched keywords in first-seen order
+def scan_trie(trie: Dict, tokens: List[str]) -> List[str]:
+    found = {}
+    for start in range(len(tokens)):
+        node = trie.get(tokens[start])
+        pos = start + 1
+        while node is not None:
+            if _END in node:
+                for keyword in node[_END]:
+                    found[keyword] = True
+            if pos >= len(tokens):
+                break
+            node = node.get(tokens[pos])
+            pos += 1
+    return list(found)
+
+# Precompiled keyword dictionary: exact lookups, partial (substring) lookups for
+# single-word terms, and a token trie that finds multi-word terms in one pass
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keywords)
+        self.single_words = frozenset(kw for kw in self.keywords if ' ' not in kw)
+        self.phrase_trie: Dict = {}
+        self.phrase_words: Set[str] = set()
+
+        # Every substring of a single-word keyword, so "scikit" -> "scikit-learn"
+        # is a set lookup instead of a scan over the whole dictionary
+        fragments = set()
+        for kw in self.single_words:
+            for start in range(len(kw)):
+                for end in range(start + 1, len(kw) + 1):
+                    fragments.add(kw[start:end])
+        self.fragments = frozenset(fragments)
+
+        for kw in self.keywords:
+            words = kw.split()
+            if len(words) > 1:
+                insert_into_trie(self.phrase_trie, words, kw)
+                self.phrase_words.update(words)
+
+    # Check if a token is exactly a keyword
+    def is_keyword(self, token: str) -> bool:
+        return token in self.keywords
+
+    # Check if a token is a keyword or part of a single-word keyword
+    def is_partial(self, token: str) -> bool:
+        return token in self.keywords or token in self.fragments
+
+    # Find multi-word keywords in a token stream (deduplicated, first-seen order)
+    def find_phrases(self, tokens: List[str]) -> List[str]:
+        return scan_trie(self.phrase_trie, tokens)
+
+    # Find all multi-word terms followed by single-word exact and partial matches
+    def match(self, tokens: List[str], min_partial_length: int = 4) -> List[str]:
+        lowered = [token.lower() for token in tokens]
+        matches = self.find_phrases(lowered)
+
+        for token in lowered:
+            if token in self.keywords:
+                matches.append(token)
+            elif len(token) >= min_partial_length and token in self.fragments:
+                matches.append(token)
+
+        return matches
+
+# Keyword lists compiled once into a single trie, answering found/missing for every
+# list against a job posting with one pass over the posting's words. Keywords and
+# postings are both split by word_tokens, so a keyword matches only whole words and
+# "c++" does not match a bare "c". Dotted words also match by their parts, so keywords
+# from cleaned resumes ("node", "js") are found in "Node.js" alongside "node.js" itself.
+# A keyword without any word characters is a ValueError.
+class JobKeywordMatcher:
+    def __init__(self, keyword_lists: List[List[Tuple[str, float]]]):
+        self.keyword_lists = keyword_lists
+        self.trie: Dict = {}
+        compiled = set()
+        for keywords in keyword_lists:
+            for keyword, _ in keywords:
+                if keyword in compiled:
+                    continue
+                compiled.add(keyword)
+                words = word_tokens(keyword)
+                if not words:
+                    raise ValueError(f"Keyword {keyword!r} contains no word characters")
+                insert_into_trie(self.trie, words, keyword)
+
+    # Keywords (from any list) that appear in the text
+    def find_keywords(self, text: str) -> Set[str]:
+        tokens = word_tokens(text)
+        found = set(scan_trie(self.trie, tokens))
+        if any('.' in token for token in tokens):
+            found.update(scan_trie(self.trie, dot_parts(tokens)))
+        return found
+
+    # Split every keyword list into (found, missing) for one job posting
+    def match(self, job_text: str) -> List[Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]]:
+        present = self.find_keywords(job_text)
+        results = []
+        for keywords in self.keyword_lists:
+            found = [(kw, score) for kw, score in keywords if kw in present]
+            missing = [(kw, score) for kw, score in keywords if kw not in present]
+            results.append((found, missing))
+        return results
+
+# Match keyword lists against job postings: results[job][list] = (found, missing)
+def match_keywords_in_jobs(keyword_lists: List[List[Tuple[str, float]]],
+                           job_texts: Iterable[str]) -> List[List[Tuple[List, List]]]:
+    with instrumentation.stage('keyword_matching') as info:
+        matcher = JobKeywordMatcher(keyword_lists)
+        results = [matcher.match(job_text) for job_text in job_texts]
+        info['items'] = len(results)
+    return results
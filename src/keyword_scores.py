@@ -0,0 +1,94 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, Iterator, List, Tuple
+
+# Per-document keyword scores in CSR form over an interned vocabulary: document i's
+# keywords are vocabulary[ids[indptr[i]:indptr[i + 1]]] with the matching scores.
+# Keyword strings are stored once instead of once per document dict, and per-keyword
+# aggregates are numpy reductions over the flat arrays.
+# Within a document, entries keep feature order, like the dicts from get_all_tfidf_scores.
+# Scores are float32 (TF-IDF weights lie in [0, 1]) and ids use uint16 when the vocabulary
+# fits, so an entry takes 6-8 bytes instead of a ~50-byte dict slot and float object.
+class KeywordScores:
+    def __init__(self, vocabulary: List[str], indptr: np.ndarray, ids: np.ndarray, scores: np.ndarray):
+        self.vocabulary = list(vocabulary)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.uint16 if len(self.vocabulary) <= 65536 else np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+
+    # Build from a TF-IDF matrix. Feature names that repeat (e.g. two stems restored to
+    # the same word) share one id; as in a dict, the first position and the last score win
+    @classmethod
+    def from_tfidf(cls, tfidf_matrix, feature_names: List[str]) -> 'KeywordScores':
+        matrix = sp.csr_matrix(tfidf_matrix)
+        matrix.sort_indices()
+        positive = matrix.data > 0
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))[positive]
+        features = matrix.indices[positive]
+        scores = matrix.data[positive]
+
+        vocabulary, feature_ids = np.unique(np.asarray(feature_names, dtype=object), return_inverse=True)
+        ids = feature_ids[features]
+        if len(vocabulary) < len(feature_names):
+            keys = rows.astype(np.int64) * len(vocabulary) + ids
+            _, first = np.unique(keys, return_index=True)
+            _, last_from_end = np.unique(keys[::-1], return_index=True)
+            last = len(keys) - 1 - last_from_end
+            order = np.argsort(first)
+            first, last = first[order], last[order]
+            rows, ids, scores = rows[first], ids[first], scores[last]
+
+        indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+        return cls(vocabulary.tolist(), indptr, ids, scores)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    # Memory held by the arrays (the vocabulary is shared by all documents)
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.ids.nbytes + self.scores.nbytes
+
+    # (keyword ids, scores) of one document
+    def row(self, doc_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[doc_index], self.indptr[doc_index + 1]
+        return self.ids[start:end], self.scores[start:end]
+
+    # One document as [(keyword, score)]
+    def keywords(self, doc_index: int) -> List[Tuple[str, float]]:
+        ids, scores = self.row(doc_index)
+        return [(self.vocabulary[i], float(s)) for i, s in zip(ids, scores)]
+
+    # One document as {keyword: score}, the get_all_tfidf_scores format
+    def to_dict(self, doc_index: int) -> Dict[str, float]:
+        return dict(self.keywords(doc_index))
+
+    def iter_dicts(self) -> Iterator[Dict[str, float]]:
+        for doc_index in range(len(self)):
+            yield self.to_dict(doc_index)
+
+    # Each document's top_n keywords, highest score first (ties keep feature order)
+    def top_k(self, top_n: int) -> 'KeywordScores':
+        from src.keyword_extractor import top_k_positions
+        counts, positions = top_k_positions(self.indptr, self.scores, top_n)
+        indptr = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return KeywordScores(self.vocabulary, indptr, self.ids[positions], self.scores[positions])
+
+    # Number of documents each keyword appears in
+    def document_frequency(self) -> np.ndarray:
+        return np.bincount(self.ids, minlength=len(self.vocabulary))
+
+    # Mean score of each keyword over the documents it appears in (0 where absent)
+    def mean_scores(self) -> np.ndarray:
+        frequency = self.document_frequency()
+        totals = np.bincount(self.ids, weights=self.scores, minlength=len(self.vocabulary))
+        return np.divide(totals, frequency, out=np.zeros(len(self.vocabulary)), where=frequency > 0)
+
+    # Keyword ids present in any document, by frequency then mean score (descending), then id
+    def rank_keywords(self) -> np.ndarray:
+        frequency, mean = self.document_frequency(), self.mean_scores()
+        present = np.flatnonzero(frequency)
+        order = np.lexsort((present, -mean[present], -frequency[present]))
+        return present[order]
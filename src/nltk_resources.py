@@ -0,0 +1,72 @@
+import importlib
+import os
+import sys
+import time
+from typing import Dict, Iterable
+
+# NLTK data packages by name, mapped to the path nltk.data.find() looks up
+RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4',
+}
+
+# Set RESUME_KEYWORDS_OFFLINE=1 to fail fast instead of downloading missing data
+_offline = os.environ.get('RESUME_KEYWORDS_OFFLINE', '').lower() in ('1', 'true', 'yes')
+_verified = set()
+_timings: Dict[str, float] = {}
+
+# Enable or disable offline mode (no nltk.download calls)
+def set_offline(offline: bool = True):
+    global _offline
+    _offline = offline
+
+def is_offline() -> bool:
+    return _offline
+
+# Import a module on first use, recording how long the import took
+def timed_import(module_name: str):
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _timings[f"import {module_name}"] = time.perf_counter() - start
+    return module
+
+# Make sure NLTK data packages are installed, probing each one at most once per process
+def require(*packages: str):
+    for package in packages:
+        if package in _verified:
+            continue
+
+        nltk = timed_import('nltk')
+        path = RESOURCES.get(package, package)
+        start = time.perf_counter()
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            if _offline:
+                raise LookupError(
+                    f"NLTK resource '{package}' is not installed and offline mode is enabled. "
+                    f"Install it with: python -m nltk.downloader {package}"
+                )
+            if not nltk.download(package, quiet=True):
+                raise LookupError(f"NLTK resource '{package}' is not installed and could not be downloaded")
+        _timings[f"find {path}"] = time.perf_counter() - start
+        _verified.add(package)
+
+# Packages already verified in this process (pass to mark_verified in worker processes)
+def verified_resources() -> set:
+    return set(_verified)
+
+# Trust packages verified by a parent process so workers skip the probes
+def mark_verified(packages: Iterable[str]):
+    _verified.update(packages)
+
+# Seconds spent on lazy imports and resource probes so far
+def get_load_timings() -> Dict[str, float]:
+    return dict(_timings)
@@ -0,0 +1,55 @@
+import csv
+import json
+from typing import Dict, List, TextIO
+
+# Row writers for batch results. Each row is written (and flushed) as soon as it is
+# ready, so downstream tools see results while the batch is still running.
+MATCH_FIELDS = ['job', 'resume', 'similarity', 'match_quality', 'top_keywords',
+                'found_keywords', 'missing_keywords']
+
+# One JSON object per line
+class JsonLinesWriter:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, row: Dict):
+        self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+# CSV with a header row; list values are joined with ';'
+class CsvWriter:
+    def __init__(self, stream: TextIO, fields: List[str] = MATCH_FIELDS):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, row: Dict):
+        self.writer.writerow({
+            key: ';'.join(str(v) for v in value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
+        self.stream.flush()
+
+# Human-readable table, one block per job
+class TextWriter:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.current_job = None
+
+    def write(self, row: Dict):
+        if row['job'] != self.current_job:
+            self.current_job = row['job']
+            self.stream.write(f"\n{'='*80}\n{row['job']}\n{'='*80}\n")
+            self.stream.write(f"{'Resume':<40} {'Similarity':<12} {'Match Quality'}\n")
+            self.stream.write("-"*80 + "\n")
+        self.stream.write(f"{row['resume']:<40} {row['similarity'] * 100:>5.2f}%      {row['match_quality']}\n")
+        self.stream.write(f"  found: {', '.join(row['found_keywords']) or '-'}\n")
+        self.stream.write(f"  missing: {', '.join(row['missing_keywords']) or '-'}\n")
+        self.stream.flush()
+
+WRITERS = {'jsonl': JsonLinesWriter, 'csv': CsvWriter, 'text': TextWriter}
+
+def open_writer(output_format: str, stream: TextIO):
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format: {output_format} (expected one of {', '.join(WRITERS)})")
+    return WRITERS[output_format](stream)
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List
+from src.cleaner import process_document
+from src.tokenizer import tokenize_and_remove_stopwords, ensure_nltk_resources
+from src.cache import DocumentCache
+from src import nltk_resources, instrumentation
+
+# Clean and tokenize a single document, reporting failures instead of raising
+def process_file(file_path: str, remove_punctuation: bool = True,
+                 cs_only: bool = True, filter_pos: bool = True,
+                 cache: DocumentCache = None) -> Dict:
+    try:
+        key = None
+        if cache is not None:
+            key = cache.make_key(file_path, remove_punctuation=remove_punctuation,
+                                 cs_only=cs_only, filter_pos=filter_pos)
+            entry = cache.get(key)
+            if entry is not None:
+                tokens = entry['tokens']
+                return {'path': file_path, 'cleaned_text': entry['cleaned_text'], 'tokens': tokens,
+                        'processed': ' '.join(tokens), 'error': None, 'cached': True}
+
+        cleaned_text = process_document(file_path, remove_punctuation=remove_punctuation)
+        tokens = tokenize_and_remove_stopwords(cleaned_text, cs_only=cs_only, filter_pos=filter_pos)
+
+        if cache is not None:
+            cache.put(key, {'cleaned_text': cleaned_text, 'tokens': tokens})
+    except Exception as e:
+        return {'path': file_path, 'cleaned_text': '', 'tokens': [], 'processed': '',
+                'error': f"{type(e).__name__}: {e}", 'cached': False}
+
+    return {'path': file_path, 'cleaned_text': cleaned_text, 'tokens': tokens,
+            'processed': ' '.join(tokens), 'error': None, 'cached': False}
+
+# process_file in a worker process, shipping any recorded stage events back with the result
+def _process_in_worker(file_path: str, **kwargs) -> Dict:
+    result = process_file(file_path, **kwargs)
+    if instrumentation.is_enabled():
+        result['events'] = instrumentation.drain_events()
+    return result
+
+# Prepare a worker process, trusting the resources the parent already verified
+def _init_worker(verified_resources: set, offline: bool, instrument: bool = False):
+    nltk_resources.set_offline(offline)
+    instrumentation.enable(instrument)
+    nltk_resources.mark_verified(verified_resources)
+    try:
+        ensure_nltk_resources()
+    except LookupError:
+        # Reported per document by process_file
+        pass
+
+# Resolve the number of worker processes (None means one per CPU)
+def resolve_workers(workers: int = None) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+# Process documents in input order, fanning out across a process pool when workers > 1
+def iter_processed_documents(file_paths: List[str], workers: int = 1,
+                             remove_punctuation: bool = True, cs_only: bool = True,
+                             filter_pos: bool = True,
+                             cache: DocumentCache = None) -> Iterator[Dict]:
+    options = dict(remove_punctuation=remove_punctuation, cs_only=cs_only,
+                   filter_pos=filter_pos, cache=cache)
+    workers = min(resolve_workers(workers), len(file_paths))
+
+    if workers <= 1:
+        for file_path in file_paths:
+            yield process_file(file_path, **options)
+    else:
+        # Small chunks keep results flowing back in order while amortizing IPC overhead
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        try:
+            ensure_nltk_resources()
+        except LookupError:
+            pass
+        init_args = (nltk_resources.verified_resources(), nltk_resources.is_offline(),
+                     instrumentation.is_enabled())
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            worker = partial(_process_in_worker, **options)
+            for result in pool.map(worker, file_paths, chunksize=chunksize):
+                instrumentation.merge_events(result.pop('events', []))
+                yield result
+
+    if cache is not None:
+        cache.evict()
+
+# Process all documents and return their results in input order
+def process_documents(file_paths: List[str], workers: int = 1,
+                      remove_punctuation: bool = True, cs_only: bool = True,
+                      filter_pos: bool = True, cache: DocumentCache = None) -> List[Dict]:
+    return list(iter_processed_documents(file_paths, workers, remove_punctuation, cs_only,
+                                         filter_pos, cache))
@@ -0,0 +1,375 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from src.cleaner import clean_text, process_document
+from src.tokenizer import tokenize_and_remove_stopwords
+from src.pipeline import _init_worker
+from src import nltk_resources
+
+# Asyncio ingestion service: accepts resumes as they arrive and scores job postings
+# against the current resume pool.
+#
+#     python -m src.service --port 8765 --workers 4
+#     python -m src.service --unix /tmp/resume-keywords.sock
+#
+# Endpoints (JSON bodies, one request per connection):
+#     POST /resumes        {"id": ..., "text": ...}                   -> 202 queued
+#     GET  /resumes/<id>   processing status of one resume
+#     POST /score          {"text": ..., "k": 10, "top_n": 10}        -> ranked resumes
+#     GET  /metrics        queue depth, pool size and per-route latency percentiles
+#     GET  /health
+#
+# CPU-heavy cleaning and tokenization run in a process pool. Resumes wait in a bounded
+# queue; when it is full, POST /resumes answers 503 with Retry-After instead of buffering
+# without limit. Score requests beyond max_pending_scores are refused the same way.
+#
+# Scoring uses a JobMatcher fitted on the pool in the background, off the request path:
+# after the pool changes it is refitted at most once per refit_interval seconds, so a
+# score request may not yet see the newest resumes ("pool_size" in the response is the
+# number of resumes it ranked). Only the first score request waits for a fit.
+#
+# Documents are uploaded as text. Server-side files ({"path": ...} instead of "text") are
+# only read when the service has an allowed_root (--allowed-root); paths are resolved
+# relative to it and anything that resolves outside it is refused with 400.
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+# Clean and tokenize one posted document (runs in a worker process)
+def process_payload(payload: Dict) -> List[str]:
+    if payload.get('path'):
+        cleaned_text = process_document(payload['path'], remove_punctuation=True)
+    else:
+        cleaned_text = clean_text(payload.get('text', ''), remove_punctuation=True)
+    return tokenize_and_remove_stopwords(cleaned_text, cs_only=True, filter_pos=True)
+
+# A positive integer field of a request body: (value, None) or (None, error message)
+def positive_int_field(body: Dict, name: str, default: int) -> Tuple[int, str]:
+    value = body.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None, f"'{name}' must be a positive integer"
+    return value, None
+
+# Request latencies per route: totals plus a window of recent samples for percentiles
+class LatencyMetrics:
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.routes: Dict[str, Dict] = {}
+
+    def record(self, route: str, seconds: float, status: int):
+        stats = self.routes.setdefault(route, {'count': 0, 'errors': 0, 'samples': deque(maxlen=self.window)})
+        stats['count'] += 1
+        if status >= 400:
+            stats['errors'] += 1
+        stats['samples'].append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        result = {}
+        for route, stats in self.routes.items():
+            samples = sorted(stats['samples'])
+            percentile = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+            result[route] = {
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'p50_ms': percentile(0.50),
+                'p99_ms': percentile(0.99),
+                'max_ms': samples[-1] * 1000,
+            }
+        return result
+
+class IngestionService:
+    def __init__(self, executor: Executor = None, workers: int = 2, queue_size: int = 100,
+                 max_pending_scores: int = 16, processor: Callable[[Dict], List[str]] = process_payload,
+                 ngram_range: Tuple[int, int] = (1, 3), max_features: int = None,
+                 allowed_root: str = None, refit_interval: float = 5.0):
+        if executor is None:
+            init_args = (nltk_resources.verified_resources(), nltk_resources.is_offline())
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args)
+        self.executor = executor
+        self.workers = workers
+        self.processor = processor
+        self.queue: asyncio.Queue = None
+        self.queue_size = queue_size
+        self.score_slots = max_pending_scores
+        self.ngram_range = ngram_range
+        self.max_features = max_features
+        self.allowed_root = os.path.realpath(allowed_root) if allowed_root else None
+        self.refit_interval = refit_interval
+        self.metrics = LatencyMetrics()
+
+        # Resume pool: id -> processed text, plus per-id status
+        self.resumes: Dict[str, str] = {}
+        self.status: Dict[str, str] = {}
+        self.version = 0
+        self._matcher = None
+        self._matcher_ids: List[str] = []
+        self._matcher_version = -1
+        self._matcher_lock: asyncio.Lock = None
+        self._pool_changed: asyncio.Event = None
+        self._consumers: List[asyncio.Task] = []
+        self._refitter: asyncio.Task = None
+        self.address = None
+
+    # Start the queue consumers (called by serve)
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._matcher_lock = asyncio.Lock()
+        self._pool_changed = asyncio.Event()
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        self._refitter = asyncio.create_task(self._refit_loop())
+
+    async def stop(self):
+        tasks = self._consumers + [self._refitter]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # Wait until every queued resume has been processed
+    async def drain(self):
+        await self.queue.join()
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            resume_id, payload = await self.queue.get()
+            self.status[resume_id] = 'processing'
+            try:
+                tokens = await loop.run_in_executor(self.executor, self.processor, payload)
+                self.resumes[resume_id] = ' '.join(tokens)
+                self.version += 1
+                self._pool_changed.set()
+                self.status[resume_id] = 'ready'
+            except Exception as e:
+                self.status[resume_id] = f"error: {type(e).__name__}: {e}"
+            finally:
+                self.queue.task_done()
+
+    # Refit the scoring matcher if the pool changed since its last fit
+    async def refresh(self):
+        from src.similarity import JobMatcher
+        async with self._matcher_lock:
+            version = self.version
+            if self._matcher_version == version:
+                return
+            ids = list(self.resumes)
+            texts = [self.resumes[resume_id] for resume_id in ids]
+            matcher = JobMatcher(self.ngram_range, self.max_features)
+            await asyncio.get_running_loop().run_in_executor(None, matcher.fit, texts)
+            self._matcher, self._matcher_ids, self._matcher_version = matcher, ids, version
+
+    # Background refits: one after the pool changes, then none for refit_interval seconds
+    async def _refit_loop(self):
+        while True:
+            await self._pool_changed.wait()
+            self._pool_changed.clear()
+            await self.refresh()
+            await asyncio.sleep(self.refit_interval)
+
+    # The latest fitted JobMatcher and the resume id of each of its rows (fitted here
+    # only if there is none yet)
+    async def _get_matcher(self):
+        if self._matcher is None:
+            await self.refresh()
+        return self._matcher, self._matcher_ids
+
+    # Document payload of a request body: uploaded text, or a file under allowed_root.
+    # Returns (payload, None) or (None, error message)
+    def _document_payload(self, body: Dict) -> Tuple[Dict, str]:
+        if body.get('text'):
+            return {'text': body['text']}, None
+        if not body.get('path'):
+            return None, "expected 'text'"
+        if self.allowed_root is None:
+            return None, "file paths are not accepted; upload the document as 'text'"
+        path = os.path.realpath(os.path.join(self.allowed_root, str(body['path'])))
+        if os.path.commonpath([path, self.allowed_root]) != self.allowed_root or not os.path.isfile(path):
+            return None, f"path {body['path']!r} is not a file under the allowed root"
+        return {'path': path}, None
+
+    async def add_resume(self, body: Dict) -> Tuple[int, Dict]:
+        payload, error = self._document_payload(body)
+        if 'id' not in body:
+            error = "expected 'id'"
+        if error:
+            return 400, {'error': error}
+        resume_id = str(body['id'])
+        try:
+            self.queue.put_nowait((resume_id, payload))
+        except asyncio.QueueFull:
+            return 503, {'error': 'ingestion queue is full, retry later'}
+        self.status[resume_id] = 'queued'
+        return 202, {'id': resume_id, 'status': 'queued', 'queue_depth': self.queue.qsize()}
+
+    async def score(self, body: Dict) -> Tuple[int, Dict]:
+        payload, error = self._document_payload(body)
+        k, k_error = positive_int_field(body, 'k', 10)
+        top_n, top_n_error = positive_int_field(body, 'top_n', 10)
+        error = error or k_error or top_n_error
+        if error:
+            return 400, {'error': error}
+        if not self.resumes:
+            return 200, {'matches': [], 'pool_size': 0}
+        if self.score_slots <= 0:
+            return 503, {'error': 'too many pending score requests, retry later'}
+
+        self.score_slots -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            tokens = await loop.run_in_executor(self.executor, self.processor, payload)
+            matcher, resume_ids = await self._get_matcher()
+            matches = await loop.run_in_executor(None, matcher.top_matches, ' '.join(tokens), k, top_n)
+        finally:
+            self.score_slots += 1
+
+        return 200, {
+            'pool_size': len(resume_ids),
+            'matches': [
+                {
+                    'id': resume_ids[match['resume']],
+                    'similarity': float(match['similarity']),
+                    'breakdown': [
+                        {'keyword': keyword, 'resume': float(r), 'job': float(j), 'contribution': float(c)}
+                        for keyword, r, j, c in match['breakdown']
+                    ],
+                }
+                for match in matches
+            ],
+        }
+
+    def get_metrics(self) -> Dict:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_size': self.queue_size,
+            'pool_size': len(self.resumes),
+            'scored_pool_size': len(self._matcher_ids),
+            'failed': sum(1 for status in self.status.values() if status.startswith('error')),
+            'routes': self.metrics.snapshot(),
+        }
+
+    async def dispatch(self, method: str, path: str, body: Dict) -> Tuple[int, Dict]:
+        if method == 'POST' and path == '/resumes':
+            return await self.add_resume(body)
+        if method == 'GET' and path.startswith('/resumes/'):
+            resume_id = path[len('/resumes/'):]
+            if resume_id not in self.status:
+                return 404, {'error': f"unknown resume {resume_id!r}"}
+            return 200, {'id': resume_id, 'status': self.status[resume_id]}
+        if method == 'POST' and path == '/score':
+            return await self.score(body)
+        if method == 'GET' and path == '/metrics':
+            return 200, self.get_metrics()
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f"no route for {method} {path}"}
+
+    # One HTTP/1.1 request per connection
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        start = time.perf_counter()
+        route = 'invalid'
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            if len(request_line) < 2:
+                status, payload = 400, {'error': 'malformed request line'}
+            else:
+                method, path = request_line[0], request_line[1]
+                route = f"{method} {'/resumes/<id>' if path.startswith('/resumes/') else path}"
+                length = headers.get('content-length', '0')
+                length = int(length) if length.isdigit() else -1
+                if length < 0:
+                    status, payload = 400, {'error': 'invalid Content-Length header'}
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': 'request body too large'}
+                else:
+                    raw = await reader.readexactly(length) if length else b''
+                    try:
+                        body = json.loads(raw) if raw else {}
+                        if isinstance(body, dict):
+                            status, payload = await self.dispatch(method, path, body)
+                        else:
+                            status, payload = 400, {'error': 'request body must be a JSON object'}
+                    except (ValueError, TypeError) as e:
+                        status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+        data = json.dumps(payload).encode('utf-8')
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Content-Type: application/json",
+                f"Content-Length: {len(data)}", "Connection: close"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+        self.metrics.record(route, time.perf_counter() - start, status)
+
+# Run the service until cancelled, on TCP or (with unix_path) a Unix socket
+async def serve(service: IngestionService, host: str = '127.0.0.1', port: int = 8765,
+                unix_path: str = None, ready: asyncio.Event = None):
+    await service.start()
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+    service.address = server.sockets[0].getsockname()
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+# Minimal blocking client for the TCP server
+def request(host: str, port: int, method: str, path: str, body: Dict = None, timeout: float = 30) -> Tuple[int, Dict]:
+    import http.client
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        connection.request(method, path, body=data, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'{}')
+    finally:
+        connection.close()
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Resume ingestion and job scoring service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="processing worker processes")
+    parser.add_argument('--queue-size', type=int, default=100, help="resumes waiting for processing")
+    parser.add_argument('--max-pending-scores', type=int, default=16)
+    parser.add_argument('--allowed-root', help="also accept {\"path\": ...} for files under this directory")
+    parser.add_argument('--refit-interval', type=float, default=5.0,
+                        help="minimum seconds between background refits of the scoring matcher")
+    args = parser.parse_args(argv)
+
+    service = IngestionService(workers=args.workers, queue_size=args.queue_size,
+                               max_pending_scores=args.max_pending_scores, allowed_root=args.allowed_root,
+                               refit_interval=args.refit_interval)
+    print(f"Listening on {args.unix or f'http://{args.host}:{args.port}'}", file=sys.stderr)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import pickle
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from sklearn.feature_extraction.text import CountVectorizer
+from src.artifacts import frozen_vectorizer
+from src.similarity import JobMatcher
+
+# Sharded resume scoring. The pool is split into contiguous shards that are scored
+# independently and merged:
+#   1. each shard counts its n-grams (document and term frequencies)
+#   2. the counts are merged into one frozen vocabulary and IDF, chosen exactly as
+#      TfidfVectorizer would choose them for the whole pool
+#   3. each shard vectorizes its resumes against the frozen vocabulary and IDF
+#   4. a job is scored on every shard and the per-shard top-k lists are merged
+# Resume vectors depend only on the resume and the frozen IDF, so similarities are
+# identical to a single JobMatcher fitted on the whole pool.
+#
+# Shards live behind a transport, which places a shard on a node and runs its methods
+# there, returning futures:
+#     open(shard_id, shard)              place a shard
+#     submit(shard_id, method, *args)    -> Future with the method's result
+#     close()
+# LocalTransport keeps shards in this process; ProcessTransport gives each shard its own
+# worker process. A transport for remote nodes only has to implement the same three calls.
+
+# One partition of the resume pool; rows are numbered globally from offset
+class ResumeShard:
+    def __init__(self, resume_texts: List[str], offset: int, ngram_range: Tuple[int, int] = (1, 3)):
+        self.resume_texts = resume_texts
+        self.offset = offset
+        self.ngram_range = tuple(ngram_range)
+        self.matcher = None
+
+    # Terms (sorted), document frequencies and total counts over this shard
+    def term_statistics(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        counter = CountVectorizer(token_pattern=r'\b\w+\b', ngram_range=self.ngram_range)
+        try:
+            counts = counter.fit_transform(self.resume_texts).tocsc()
+        except ValueError:
+            # No resumes, or no terms in any of them
+            return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        document_frequency = np.diff(counts.indptr)
+        term_frequency = np.asarray(counts.sum(axis=0)).ravel()
+        return counter.get_feature_names_out().tolist(), document_frequency, term_frequency
+
+    # Vectorize the shard's resumes against the global vocabulary and IDF
+    def freeze(self, vocabulary: List[str], idf: np.ndarray) -> int:
+        matcher = JobMatcher(self.ngram_range)
+        matcher.vectorizer = frozen_vectorizer(vocabulary, idf, self.ngram_range)
+        matcher.resume_matrix = matcher.vectorizer.transform(self.resume_texts).tocsr()
+        matcher.feature_names = vocabulary
+        self.matcher = matcher
+        self.resume_texts = None
+        return matcher.resume_matrix.shape[0]
+
+    # This shard's top-k resumes for one job, with global resume rows
+    def top_matches(self, job_text: str, k: int, top_n: int) -> List[Dict]:
+        matches = self.matcher.top_matches(job_text, k, top_n)
+        for match in matches:
+            match['resume'] += self.offset
+        return matches
+
+    # Similarity of this shard's resumes to every job (shard resumes x jobs)
+    def score(self, job_texts: List[str]) -> np.ndarray:
+        return self.matcher.score(job_texts)
+
+# Global vocabulary and IDF from per-shard term statistics, the same TfidfVectorizer
+# (smoothed IDF, and max_features keeping the most frequent terms) gives on the whole pool
+def merge_term_statistics(statistics: List[Tuple[List[str], np.ndarray, np.ndarray]], n_documents: int,
+                          max_features: int = None) -> Tuple[List[str], np.ndarray]:
+    terms = np.array([term for shard_terms, _, _ in statistics for term in shard_terms], dtype=object)
+    if len(terms) == 0:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+    vocabulary, columns = np.unique(terms, return_inverse=True)
+    document_frequency = np.bincount(columns, weights=np.concatenate([df for _, df, _ in statistics])).astype(np.int64)
+    term_frequency = np.bincount(columns, weights=np.concatenate([tf for _, _, tf in statistics])).astype(np.int64)
+
+    if max_features is not None and len(vocabulary) > max_features:
+        # Same selection as CountVectorizer._limit_features, on the same integer counts
+        keep = np.sort((-term_frequency).argsort()[:max_features])
+        vocabulary, document_frequency = vocabulary[keep], document_frequency[keep]
+
+    idf = np.full(len(vocabulary), n_documents + 1, dtype=np.float64)
+    idf /= document_frequency + 1.0
+    np.log(idf, out=idf)
+    idf += 1.0
+    return vocabulary.tolist(), idf
+
+# In-process stand-in for remote nodes: shard calls run on a thread pool, and every
+# shard, request and reply is pickled on the way, as it would be on the wire
+class LocalTransport:
+    def __init__(self, workers: int = 4, serialize: bool = True):
+        self.executor = ThreadPoolExecutor(workers)
+        self.serialize = serialize
+        self.shards: Dict[int, ResumeShard] = {}
+
+    def _wire(self, value):
+        return pickle.loads(pickle.dumps(value)) if self.serialize else value
+
+    def open(self, shard_id: int, shard: ResumeShard):
+        self.shards[shard_id] = self._wire(shard)
+
+    def submit(self, shard_id: int, method: str, *args) -> Future:
+        shard = self.shards[shard_id]
+        request = self._wire(args)
+        return self.executor.submit(lambda: self._wire(getattr(shard, method)(*request)))
+
+    def close(self):
+        self.executor.shutdown()
+        self.shards.clear()
+
+# Shard state inside a ProcessTransport worker
+_WORKER_SHARDS: Dict[int, ResumeShard] = {}
+
+def _install_shard(shard_id: int, shard: ResumeShard):
+    _WORKER_SHARDS[shard_id] = shard
+
+def _call_shard(shard_id: int, method: str, args: Tuple):
+    return getattr(_WORKER_SHARDS[shard_id], method)(*args)
+
+# Each shard in its own worker process, which keeps the shard's matrix between calls
+class ProcessTransport:
+    def __init__(self):
+        self.executors: Dict[int, ProcessPoolExecutor] = {}
+
+    def open(self, shard_id: int, shard: ResumeShard):
+        executor = ProcessPoolExecutor(max_workers=1)
+        executor.submit(_install_shard, shard_id, shard).result()
+        self.executors[shard_id] = executor
+
+    def submit(self, shard_id: int, method: str, *args) -> Future:
+        return self.executors[shard_id].submit(_call_shard, shard_id, method, args)
+
+    def close(self):
+        for executor in self.executors.values():
+            executor.shutdown()
+        self.executors.clear()
+
+# JobMatcher over a sharded resume pool (same results as JobMatcher on the whole pool)
+class ShardedMatcher:
+    def __init__(self, n_shards: int = 4, transport=None, ngram_range: Tuple[int, int] = (1, 3),
+                 max_features: int = None):
+        self.n_shards = n_shards
+        self.transport = transport if transport is not None else LocalTransport(workers=n_shards)
+        self.ngram_range = tuple(ngram_range)
+        self.max_features = max_features
+        self.shard_ids: List[int] = []
+        self.vocabulary = None
+        self.idf = None
+
+    # Run a method on every shard and collect the results in shard order
+    def _gather(self, method: str, *args) -> List:
+        futures = [self.transport.submit(shard_id, method, *args) for shard_id in self.shard_ids]
+        return [future.result() for future in futures]
+
+    # Partition the resumes, then build and freeze the global vocabulary and IDF
+    # (a pool smaller than n_shards gets one shard per resume)
+    def fit(self, resume_texts: List[str]) -> 'ShardedMatcher':
+        n_shards = max(1, min(self.n_shards, len(resume_texts)))
+        bounds = np.linspace(0, len(resume_texts), n_shards + 1).astype(int)
+        self.shard_ids = list(range(n_shards))
+        for shard_id in self.shard_ids:
+            start, end = bounds[shard_id], bounds[shard_id + 1]
+            self.transport.open(shard_id, ResumeShard(resume_texts[start:end], int(start), self.ngram_range))
+
+        statistics = self._gather('term_statistics')
+        self.vocabulary, self.idf = merge_term_statistics(statistics, len(resume_texts), self.max_features)
+        self._gather('freeze', self.vocabulary, self.idf)
+        return self
+
+    # Cosine similarity of every resume against every job (resumes x jobs)
+    def score(self, job_texts: List[str]) -> np.ndarray:
+        if self.vocabulary is None:
+            raise ValueError("ShardedMatcher must be fit on resumes before scoring jobs")
+        return np.vstack(self._gather('score', job_texts))
+
+    # Global top-k resumes for one job: every shard's top-k, merged by similarity then row
+    def top_matches(self, job_text: str, k: int = 50, top_n: int = 20) -> List[Dict]:
+        if self.vocabulary is None:
+            raise ValueError("ShardedMatcher must be fit on resumes before scoring jobs")
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        matches = [match for shard_matches in self._gather('top_matches', job_text, k, top_n)
+                   for match in shard_matches]
+        matches.sort(key=lambda match: (-match['similarity'], match['resume']))
+        return matches[:k]
+
+    def close(self):
+        self.transport.close()
@@ -1,7 +1,12 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import List, Tuple, Dict
+import scipy.sparse as sp
+from typing import List, Tuple, Dict, Iterable, Iterator
+from src.ann import RandomProjectionIndex
+from src.instrumentation import instrumented
+from src.hashing_vectorizer import HashingTfidfVectorizer
+from src.artifacts import CorpusArtifact, frozen_vectorizer
 
 # Compute cosine similarity matrix for a list of documents
 def compute_cosine_similarity(documents: List[str], ngram_range: Tuple[int, int] = (1, 3), 
@@ -37,65 +42,215 @@ def compute_resume_job_similarities(resume_texts: List[str], job_text: str,
     
     return similarities
 
+# Select the top_n entries by contribution, breaking ties by feature index like a stable sort
+def _top_contributions(columns: np.ndarray, contributions: np.ndarray, top_n: int) -> np.ndarray:
+    if top_n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if len(contributions) > top_n:
+        # Partial selection, keeping every entry tied with the cutoff value
+        cutoff = np.partition(contributions, len(contributions) - top_n)[len(contributions) - top_n]
+        candidates = np.flatnonzero(contributions >= cutoff)
+    else:
+        candidates = np.arange(len(contributions))
+    order = np.lexsort((columns[candidates], -contributions[candidates]))
+    return candidates[order[:top_n]]
+
+# Get similarity breakdowns for every resume row against one job vector at once.
+# Only features that are non-zero in the job are visited, and each row's top_n
+# contributions are picked with partial selection instead of a full sort.
+def get_similarity_breakdowns(resume_matrix, job_vector, feature_names: List[str],
+                              top_n: int = 20) -> List[List[Tuple[str, float, float, float]]]:
+    resume_matrix = sp.csr_matrix(resume_matrix)
+    job_vector = sp.csr_matrix(job_vector)
+    job_vector.sum_duplicates()
+
+    job_columns = job_vector.indices
+    job_scores = job_vector.data
+
+    # Restrict resumes to the job's non-zero features, then scale by the job scores
+    sub_matrix = resume_matrix[:, job_columns].tocsr()
+    sub_matrix.sum_duplicates()
+    resume_scores = sub_matrix.data
+    columns = job_columns[sub_matrix.indices]
+    matched_job_scores = job_scores[sub_matrix.indices]
+    contributions = resume_scores * matched_job_scores
+
+    breakdowns = []
+    for row in range(sub_matrix.shape[0]):
+        start, end = sub_matrix.indptr[row], sub_matrix.indptr[row + 1]
+        row_contributions = contributions[start:end]
+        positive = np.flatnonzero(row_contributions > 0) + start
+        selected = positive[_top_contributions(columns[positive], contributions[positive], top_n)]
+        breakdowns.append([
+            (feature_names[columns[i]], resume_scores[i], matched_job_scores[i], contributions[i])
+            for i in selected
+        ])
+
+    return breakdowns
+
 # Get similarity breakdown for a specific resume
 def get_similarity_breakdown(doc1_vector, doc2_vector, feature_names: List[str], 
                              top_n: int = 20) -> List[Tuple[str, float, float, float]]:
-    doc1_array = doc1_vector.toarray()[0] if hasattr(doc1_vector, 'toarray') else doc1_vector
-    doc2_array = doc2_vector.toarray()[0] if hasattr(doc2_vector, 'toarray') else doc2_vector
-    
-    contributions = []
-    for idx, feature in enumerate(feature_names):
-        score1 = doc1_array[idx]
-        score2 = doc2_array[idx]
-        
-        # Contribution is the product of both scores (both must be non-zero to contribute)
-        contribution = score1 * score2
-        
-        if contribution > 0:
-            contributions.append((feature, score1, score2, contribution))
+    if not sp.issparse(doc1_vector):
+        doc1_vector = np.atleast_2d(doc1_vector)
+    if not sp.issparse(doc2_vector):
+        doc2_vector = np.atleast_2d(doc2_vector)
     
-    # Sort by contribution (descending)
-    contributions.sort(key=lambda x: x[3], reverse=True)
-    
-    return contributions[:top_n]
+    return get_similarity_breakdowns(doc1_vector, doc2_vector, feature_names, top_n)[0]
 
 # Compute similarity with breakdown
+# With n_features set, n-grams are hashed into that many columns (bounded memory, no
+# vocabulary) instead of building a vocabulary; max_features is then ignored
+@instrumented('similarity', items=lambda resume_texts, *args, **kwargs: len(resume_texts))
 def compute_similarity_with_breakdown(resume_texts: List[str], job_text: str,
                                      ngram_range: Tuple[int, int] = (1, 3),
                                      max_features: int = None,
-                                     top_n: int = 20) -> List[Dict]:
-    # Create vectorizer and compute TF-IDF
-    vectorizer = TfidfVectorizer(
-        ngram_range=ngram_range,
-        max_features=max_features,
-        token_pattern=r'\b\w+\b'
-    )
-
-    # Compute TF-IDF matrix
+                                     top_n: int = 20,
+                                     n_features: int = None) -> List[Dict]:
     all_documents = resume_texts + [job_text]
-    tfidf_matrix = vectorizer.fit_transform(all_documents)
-    feature_names = vectorizer.get_feature_names_out()
+    if n_features is not None:
+        vectorizer = HashingTfidfVectorizer(n_features, ngram_range, use_stemming=False)
+        vectorizer.fit(all_documents)
+        tfidf_matrix = vectorizer.transform(all_documents)
+        feature_names = vectorizer.feature_names
+    else:
+        # Create vectorizer and compute TF-IDF
+        vectorizer = TfidfVectorizer(
+            ngram_range=ngram_range,
+            max_features=max_features,
+            token_pattern=r'\b\w+\b'
+        )
+
+        # Compute TF-IDF matrix
+        tfidf_matrix = vectorizer.fit_transform(all_documents)
+        feature_names = vectorizer.get_feature_names_out()
 
     # Get job vector
     job_index = len(resume_texts)
     job_vector = tfidf_matrix[job_index]
+    resume_matrix = tfidf_matrix[:job_index]
     
-    results = []
-    for resume_idx in range(len(resume_texts)):
-        resume_vector = tfidf_matrix[resume_idx]
-        
-        # Compute similarity
-        similarity = cosine_similarity(resume_vector, job_vector)[0, 0]
-        
-        # Get breakdown
-        breakdown = get_similarity_breakdown(resume_vector, job_vector, feature_names, top_n)
-        
-        results.append({
-            'similarity': similarity,
-            'breakdown': breakdown
-        })
+    # Compute similarities and breakdowns for all resumes at once
+    similarities = cosine_similarity(resume_matrix, job_vector)[:, 0]
+    breakdowns = get_similarity_breakdowns(resume_matrix, job_vector, feature_names, top_n)
     
-    return results
+    return [
+        {'similarity': similarity, 'breakdown': breakdown}
+        for similarity, breakdown in zip(similarities, breakdowns)
+    ]
+
+# Fit the resume corpus once, then score any number of job descriptions against it.
+# IDF weights come from the resumes alone, so scores differ slightly from
+# compute_similarity_with_breakdown, which refits with the job included.
+class JobMatcher:
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 3), max_features: int = None):
+        self.ngram_range = tuple(ngram_range)
+        self.max_features = max_features
+        self.vectorizer = None
+        self.resume_matrix = None
+        self.feature_names = None
+        # Row ids of a matcher opened with load (None for a fitted matcher)
+        self.resume_ids = None
+
+    # Fit the vocabulary and IDF on the resume corpus
+    # Resume rows are weighted from index-sorted counts, exactly as transform() weights new
+    # documents, so a resume vectorized elsewhere (e.g. on a shard) gets identical values
+    @instrumented('tfidf_fit', items=lambda self, resume_texts: len(resume_texts))
+    def fit(self, resume_texts: List[str]) -> 'JobMatcher':
+        counter = CountVectorizer(
+            ngram_range=self.ngram_range,
+            max_features=self.max_features,
+            token_pattern=r'\b\w+\b'
+        )
+        counts = counter.fit_transform(resume_texts)
+        counts.sort_indices()
+        transformer = TfidfTransformer().fit(counts)
+        self.resume_matrix = transformer.transform(counts).tocsr()
+        self.feature_names = counter.get_feature_names_out()
+        self.vectorizer = frozen_vectorizer(self.feature_names, transformer.idf_, self.ngram_range)
+        return self
+
+    # Vectorize job descriptions against the fitted vocabulary
+    def transform_jobs(self, job_texts: List[str]):
+        if self.resume_matrix is None:
+            raise ValueError("JobMatcher must be fit on resumes before scoring jobs")
+        return self.vectorizer.transform(job_texts).tocsr()
+
+    # Cosine similarity of every resume against every job (resumes x jobs)
+    @instrumented('similarity', items=lambda self, job_texts: len(job_texts))
+    def score(self, job_texts: List[str]) -> np.ndarray:
+        job_matrix = self.transform_jobs(job_texts)
+        # Rows are L2-normalized by the vectorizer, so the dot product is the cosine
+        return (self.resume_matrix @ job_matrix.T).toarray()
+
+    # Score a stream of job postings in batches, yielding one resume-score column per job
+    def score_stream(self, job_texts: Iterable[str], batch_size: int = 64) -> Iterator[np.ndarray]:
+        batch = []
+        for job_text in job_texts:
+            batch.append(job_text)
+            if len(batch) >= batch_size:
+                yield from self.score(batch).T
+                batch = []
+        if batch:
+            yield from self.score(batch).T
+
+    # Similarity and top contributing keywords of every resume for one job
+    def score_with_breakdown(self, job_text: str, top_n: int = 20) -> List[Dict]:
+        job_vector = self.transform_jobs([job_text])
+        similarities = (self.resume_matrix @ job_vector.T).toarray()[:, 0]
+        breakdowns = get_similarity_breakdowns(self.resume_matrix, job_vector, self.feature_names, top_n)
+
+        return [
+            {'similarity': similarity, 'breakdown': breakdown}
+            for similarity, breakdown in zip(similarities, breakdowns)
+        ]
+
+    # Build an approximate-nearest-neighbour index over the fitted resumes
+    def build_ann_index(self, n_tables: int = 8, n_bits: int = 12, probes: int = 1,
+                        seed: int = 0) -> RandomProjectionIndex:
+        if self.resume_matrix is None:
+            raise ValueError("JobMatcher must be fit on resumes before building an ANN index")
+        return RandomProjectionIndex(n_tables, n_bits, probes, seed).fit(self.resume_matrix)
+
+    # Top-k resumes for one job with breakdowns. With an ANN index, exact cosine and
+    # breakdowns are only computed for the shortlisted resumes.
+    def top_matches(self, job_text: str, k: int = 50, top_n: int = 20,
+                    ann_index: RandomProjectionIndex = None, max_candidates: int = None) -> List[Dict]:
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        job_vector = self.transform_jobs([job_text])
+        if ann_index is not None:
+            rows = ann_index.shortlist(job_vector, max_candidates)
+        else:
+            rows = np.arange(self.resume_matrix.shape[0])
+
+        candidates = self.resume_matrix[rows]
+        similarities = (candidates @ job_vector.T).toarray()[:, 0]
+        ranking = np.lexsort((rows, -similarities))[:k]
+        breakdowns = get_similarity_breakdowns(candidates[ranking], job_vector, self.feature_names, top_n)
+
+        return [
+            {'resume': int(rows[i]), 'similarity': similarities[i], 'breakdown': breakdown}
+            for i, breakdown in zip(ranking, breakdowns)
+        ]
+
+    # Save the fitted resumes, vocabulary and IDF as a memory-mappable corpus artifact
+    def save(self, directory: str, resume_ids: List[str] = None):
+        if self.resume_matrix is None:
+            raise ValueError("JobMatcher must be fit on resumes before saving")
+        CorpusArtifact.from_tfidf(self.resume_matrix, self.vectorizer, resume_ids=resume_ids,
+                                  use_stemming=False).save(directory)
+
+    # Open a saved matcher without refitting; resume rows stay memory-mapped when mmap=True
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'JobMatcher':
+        artifact = CorpusArtifact.load(directory, mmap)
+        matcher = cls(artifact.ngram_range)
+        matcher.vectorizer = artifact.build_vectorizer()
+        matcher.resume_matrix = artifact.tfidf_matrix
+        matcher.feature_names = artifact.feature_names
+        matcher.resume_ids = artifact.resume_ids
+        return matcher
 
 # Interpret similarity score
 def interpret_similarity_score(score: float) -> str:
@@ -1,34 +1,81 @@
-import nltk
-from nltk.stem import PorterStemmer, WordNetLemmatizer
-from typing import List, Dict, Tuple
-from collections import Counter
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-try:
-    nltk.data.find('corpora/omw-1.4')
-except LookupError:
-    nltk.download('omw-1.4')
-
-# Stem tokens and create mapping from stemmed forms to original words
-# Lemmatizer for future work (gave up midway)
-def stem_tokens(tokens: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
-    stemmer = PorterStemmer()
-    stemmed = [stemmer.stem(token) for token in tokens]
-
-    # Create mapping from stem to original words
+from typing import List, Dict, Tuple, Iterable
+from collections import Counter, OrderedDict
+import json
+import os
+from src import nltk_resources
+
+# Upper bound on memoized token -> stem entries (least recently used are dropped first)
+STEM_CACHE_SIZE = 200000
+
+_stemmer = None
+# Kept in least- to most-recently-used order
+_stem_cache: 'OrderedDict[str, str]' = OrderedDict()
+
+# Get the shared Porter stemmer
+def get_stemmer():
+    global _stemmer
+    if _stemmer is None:
+        _stemmer = nltk_resources.timed_import('nltk.stem').PorterStemmer()
+    return _stemmer
+
+# Stem each distinct token once, using and filling the shared cache, and return token -> stem
+def stem_unique(tokens: Iterable[str]) -> Dict[str, str]:
+    stems = {}
+    stemmer = None
+    for token in set(tokens):
+        stem = _stem_cache.get(token)
+        if stem is None:
+            if stemmer is None:
+                stemmer = get_stemmer()
+            stem = stemmer.stem(token)
+            _stem_cache[token] = stem
+        else:
+            _stem_cache.move_to_end(token)
+        stems[token] = stem
+    _trim_stem_cache()
+    return stems
+
+# Drop least recently used stems until the cache fits STEM_CACHE_SIZE
+def _trim_stem_cache():
+    while len(_stem_cache) > STEM_CACHE_SIZE:
+        _stem_cache.popitem(last=False)
+
+# Save the stem cache so later runs (or pool workers) can start warm
+def save_stem_cache(path: str):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_stem_cache, f)
+    os.replace(tmp_path, path)
+
+# Load a stem cache written by save_stem_cache, if it exists
+def load_stem_cache(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as f:
+        _stem_cache.update(json.load(f))
+    _trim_stem_cache()
+    return len(_stem_cache)
+
+# Drop all memoized stems
+def clear_stem_cache():
+    _stem_cache.clear()
+
+# Stem tokens and create mapping from stemmed forms to counts of the original words
+# Lemmatizer for future work (gave up midway; needs nltk_resources.require('wordnet', 'omw-1.4'))
+def stem_tokens(tokens: List[str]) -> Tuple[List[str], Dict[str, Counter]]:
+    stems = stem_unique(tokens)
+    stemmed = [stems[token] for token in tokens]
+
+    # Count each (stem, original) pair once instead of keeping every occurrence
     stem_to_original = {}
-    for original, stem in zip(tokens, stemmed):
+    for (stem, original), count in Counter(zip(stemmed, tokens)).items():
         if stem not in stem_to_original:
-            stem_to_original[stem] = []
-        stem_to_original[stem].append(original)
+            stem_to_original[stem] = Counter()
+        stem_to_original[stem][original] = count
     
     return stemmed, stem_to_original
 
-# Choose representative original word for each stem
+# Choose representative original word for each stem (from a list or Counter of originals)
 def get_representative_word(stem: str, original_words: List[str]) -> str:
     if not original_words:
         return stem
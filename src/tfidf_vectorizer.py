@@ -1,9 +1,13 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
-from typing import List, Tuple, Dict
-from src.stemmer import stem_with_mapping
+import scipy.sparse as sp
+from typing import List, Tuple, Dict, Iterator
+from src.stemmer import stem_with_mapping, stem_unique
+from src.instrumentation import instrumented
+from src.keyword_scores import KeywordScores
 
 # Compute TF-IDF matrix for a collection of documents.
+@instrumented('tfidf_fit', items=lambda documents, *args, **kwargs: len(documents))
 def compute_tfidf(documents: List[str], max_features: int = None, 
                   min_df: int = 1, max_df: float = 1.0, ngram_range: Tuple[int, int] = (1, 3),
                   use_stemming: bool = True) -> Tuple[np.ndarray, List[str], TfidfVectorizer, Dict[str, str]]:
@@ -53,17 +57,57 @@ def compute_tfidf(documents: List[str], max_features: int = None,
     
     return tfidf_matrix, feature_names, vectorizer, stem_mapping
 
+# Vectorize new documents (e.g. job descriptions) with a vectorizer fitted by compute_tfidf
+def transform_documents(vectorizer: TfidfVectorizer, documents: List[str], use_stemming: bool = True):
+    if use_stemming:
+        stemmed_docs = []
+        for doc in documents:
+            tokens = doc.split()
+            stems = stem_unique(tokens)
+            stemmed_docs.append(' '.join(stems[token] for token in tokens))
+        documents = stemmed_docs
+    
+    return vectorizer.transform(documents)
+
+# Get the (feature indices, scores) of a document's non-zero entries straight from the CSR arrays
+def _sparse_row(tfidf_matrix, doc_index: int) -> Tuple[np.ndarray, np.ndarray]:
+    start, end = tfidf_matrix.indptr[doc_index], tfidf_matrix.indptr[doc_index + 1]
+    indices = tfidf_matrix.indices[start:end]
+    data = tfidf_matrix.data[start:end]
+    
+    # Keep feature order stable and drop explicit zeros
+    order = np.argsort(indices, kind='stable')
+    indices, data = indices[order], data[order]
+    positive = data > 0
+    return indices[positive], data[positive]
+
 # Extract TF-IDF scores for a specific document
-def get_tfidf_scores(tfidf_matrix: np.ndarray, feature_names: List[str], 
+def get_tfidf_scores(tfidf_matrix, feature_names: List[str], 
                      doc_index: int = 0) -> Dict[str, float]:
-    feature_array = tfidf_matrix.toarray()[doc_index]
-    tfidf_scores = {}
+    if not sp.issparse(tfidf_matrix):
+        tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+    elif tfidf_matrix.format != 'csr':
+        tfidf_matrix = tfidf_matrix.tocsr()
     
-    for idx, score in enumerate(feature_array):
-        if score > 0:
-            tfidf_scores[feature_names[idx]] = score
+    indices, data = _sparse_row(tfidf_matrix, doc_index)
+    return {feature_names[idx]: score for idx, score in zip(indices, data)}
+
+# Yield TF-IDF score dicts for every document without densifying the matrix
+def iter_tfidf_scores(tfidf_matrix, feature_names: List[str]) -> Iterator[Dict[str, float]]:
+    tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+    for doc_idx in range(tfidf_matrix.shape[0]):
+        indices, data = _sparse_row(tfidf_matrix, doc_idx)
+        yield {feature_names[idx]: score for idx, score in zip(indices, data)}
+
+# Get the top-k (feature indices, scores) for a document, highest score first
+def get_top_tfidf_features(tfidf_matrix, doc_index: int, 
+                           top_n: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+    indices, data = _sparse_row(tfidf_matrix, doc_index)
     
-    return tfidf_scores
+    # Sort by score descending, then feature index for ties
+    order = np.lexsort((indices, -data))[:top_n]
+    return indices[order], data[order]
 
 # Get TF-IDF scores for all documents
 def get_all_tfidf_scores(documents: List[str], max_features: int = None, 
@@ -79,10 +123,20 @@ def get_all_tfidf_scores(documents: List[str], max_features: int = None,
         use_stemming=use_stemming
     )
     
-    results = []
-    # Extract scores for each document
-    for doc_idx in range(len(documents)):
-        scores = get_tfidf_scores(tfidf_matrix, feature_names, doc_idx)
-        results.append(scores)
-    
-    return results
+    # Extract scores for each document by walking the sparse rows
+    return list(iter_tfidf_scores(tfidf_matrix, feature_names))
+
+# Get TF-IDF scores for all documents as one array-backed KeywordScores
+def get_keyword_scores(documents: List[str], max_features: int = None, 
+                       min_df: int = 1, max_df: float = 1.0,
+                       ngram_range: Tuple[int, int] = (1, 3),
+                       use_stemming: bool = True) -> KeywordScores:
+    tfidf_matrix, feature_names, _, _ = compute_tfidf(
+        documents, 
+        max_features=max_features,
+        min_df=min_df,
+        max_df=max_df,
+        ngram_range=ngram_range, 
+        use_stemming=use_stemming
+    )
+    return KeywordScores.from_tfidf(tfidf_matrix, feature_names)
@@ -1,24 +1,16 @@
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk import pos_tag
 from typing import List
+from functools import lru_cache
+import hashlib
 import re
+from src.keyword_matcher import KeywordMatcher
+from src import nltk_resources, instrumentation
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# NLTK is imported and its data probed on first use, not at import time
+TOKENIZER_RESOURCES = ('punkt', 'stopwords', 'averaged_perceptron_tagger')
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
+# Make sure the NLTK data used by the tokenizer is available (probed once per process)
+def ensure_nltk_resources():
+    nltk_resources.require(*TOKENIZER_RESOURCES)
 
 # Computer Science and Technical Terms Dictionary
 CS_KEYWORDS = {
@@ -101,23 +93,55 @@ MONTHS = {
     'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'
 }
 
-# Normalize degree abbreviations in text
+# Fingerprint of the keyword dictionaries, used to invalidate cached results when they change
+def keyword_dictionary_version() -> str:
+    digest = hashlib.sha256()
+    for term in sorted(CS_KEYWORDS):
+        digest.update(term.encode('utf-8') + b'\0')
+    for abbr, full_form in sorted(DEGREE_ABBREVIATIONS.items()):
+        digest.update(f"{abbr}={full_form}".encode('utf-8') + b'\0')
+    for word in sorted(MONTHS):
+        digest.update(word.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+_cs_matcher = None
+
+# Get the compiled matcher for CS_KEYWORDS, rebuilding it if the dictionary was extended
+def get_cs_matcher() -> KeywordMatcher:
+    global _cs_matcher
+    if _cs_matcher is None or _cs_matcher.keywords != CS_KEYWORDS:
+        _cs_matcher = KeywordMatcher(CS_KEYWORDS)
+    return _cs_matcher
+
+_abbreviation_pattern = None
+_abbreviation_items = None
+
+# Get one alternation regex covering every entry in DEGREE_ABBREVIATIONS
+def get_abbreviation_pattern():
+    global _abbreviation_pattern, _abbreviation_items
+    items = tuple(DEGREE_ABBREVIATIONS.items())
+    if _abbreviation_pattern is None or items != _abbreviation_items:
+        # Longest first so "b.s." wins over "b.s" where both match
+        alternation = '|'.join(re.escape(abbr) for abbr in sorted(DEGREE_ABBREVIATIONS, key=len, reverse=True))
+        _abbreviation_pattern = re.compile(r'\b(?:' + alternation + r')\b')
+        _abbreviation_items = items
+    return _abbreviation_pattern
+
+# Normalize degree abbreviations in text (single pass over the text)
 def normalize_abbreviations(text: str) -> str:
     text_lower = text.lower()
-    for abbr, full_form in DEGREE_ABBREVIATIONS.items():
-        # Match abbreviation with word boundaries
-        pattern = r'\b' + re.escape(abbr) + r'\b'
-        text_lower = re.sub(pattern, full_form, text_lower)
-    return text_lower
+    return get_abbreviation_pattern().sub(lambda m: DEGREE_ABBREVIATIONS[m.group(0)], text_lower)
 
 # Tokenize text into words
 def tokenize(text: str) -> List[str]:
     # Normalize abbreviations first
     text = normalize_abbreviations(text)
-    return word_tokenize(text)
+    nltk_resources.require('punkt')
+    with instrumentation.stage('tokenize'):
+        return nltk_resources.timed_import('nltk.tokenize').word_tokenize(text)
 
 # Determine if a word is relevant based on its POS tag
-def is_relevant_word(word: str, pos: str) -> bool:
+def is_relevant_word(word: str, pos: str, matcher: KeywordMatcher = None) -> bool:
     word_lower = word.lower()
     
     # Filter out months
@@ -126,8 +150,10 @@ def is_relevant_word(word: str, pos: str) -> bool:
     
     # Filter out most verbs (VB*) and adjectives (JJ*) unless they're technical terms
     if pos.startswith('VB') or pos.startswith('JJ'):
-        # Keep if it's a CS keyword
-        if word_lower not in CS_KEYWORDS and not any(word_lower in kw for kw in CS_KEYWORDS if ' ' not in kw):
+        # Keep if it's a CS keyword or part of one
+        if matcher is None:
+            matcher = get_cs_matcher()
+        if not matcher.is_partial(word_lower):
             return False
     
     # Filter out adverbs
@@ -137,55 +163,156 @@ def is_relevant_word(word: str, pos: str) -> bool:
     return True
 
 # Extract CS keywords from tokens
+# Multi-word terms come first, then exact and partial (e.g. "scikit" in "scikit-learn") matches
 def extract_cs_keywords(tokens: List[str]) -> List[str]:
-    cs_tokens = []
-    
-    # Check for multi-word CS terms first
-    text = ' '.join(tokens).lower()
-    multi_word_terms = [kw for kw in CS_KEYWORDS if ' ' in kw]
-    
-    found_multi_word = set()
-    for term in multi_word_terms:
-        if term in text:
-            found_multi_word.add(term)
-    
-    # Add multi-word terms
-    cs_tokens.extend(found_multi_word)
-    
-    # Check single-word tokens
-    for token in tokens:
-        token_lower = token.lower()
-        # Check if token is a CS keyword or part of one
-        if token_lower in CS_KEYWORDS:
-            cs_tokens.append(token_lower)
-        # Also check for partial matches (e.g., "scikit" in "scikit-learn")
-        elif any(token_lower in kw for kw in CS_KEYWORDS if ' ' not in kw and len(token_lower) > 3):
-            cs_tokens.append(token_lower)
-    
-    return cs_tokens
+    return get_cs_matcher().match(tokens)
+
+# Stopword set for a language, loaded once
+@lru_cache(maxsize=None)
+def get_stop_words(language: str = 'english') -> frozenset:
+    nltk_resources.require('stopwords')
+    return frozenset(nltk_resources.timed_import('nltk.corpus').stopwords.words(language))
+
+# The perceptron tagger behind nltk.pos_tag, loaded once
+@lru_cache(maxsize=None)
+def get_pos_tagger():
+    nltk_resources.require('averaged_perceptron_tagger')
+    return nltk_resources.timed_import('nltk.tag').PerceptronTagger()
+
+# Consecutive word pairs of every multi-word keyword; a dropped token can only create
+# a phrase match if the words on either side of it form one of these pairs
+def get_phrase_pairs(matcher: KeywordMatcher) -> frozenset:
+    pairs = getattr(matcher, '_phrase_pairs', None)
+    if pairs is None:
+        pairs = frozenset(
+            (a, b) for kw in matcher.keywords for a, b in zip(kw.split(), kw.split()[1:])
+        )
+        matcher._phrase_pairs = pairs
+    return pairs
+
+# Keep/drop decisions for words whose tag does not depend on context (tagger.tagdict hits).
+# A decision depends only on the word, its tag and the matcher, so it is memoized on
+# (word, tag): switching taggers can change a word's tag but never reuses a stale decision.
+_tag_decisions: dict = {}
+_tag_decisions_matcher = None
+
+def _context_free_decision(word: str, tag: str, matcher: KeywordMatcher) -> bool:
+    global _tag_decisions_matcher
+    if _tag_decisions_matcher is not matcher:
+        _tag_decisions.clear()
+        _tag_decisions_matcher = matcher
+    decision = _tag_decisions.get((word, tag))
+    if decision is None:
+        decision = _tag_decisions[(word, tag)] = is_relevant_word(word, tag, matcher)
+    return decision
+
+# Decide keep/drop for the given token positions (ascending) from their POS tags.
+# The perceptron tagger looks up tagdict words without context and tags every other word
+# from the two words on either side and the two previous tags. A word's tag is therefore
+# exact when tagged in a segment that starts at the document start or at two consecutive
+# tagdict words, and runs two words past it; such segments are tagged in one batch.
+def _decide_by_tag(tokens: List[str], positions: List[int], anchors: List[int], tagger,
+                   matcher: KeywordMatcher, keep: dict):
+    segments = []
+    for i in positions:
+        tag = tagger.tagdict.get(tokens[i])
+        if tag:
+            keep[i] = _context_free_decision(tokens[i], tag, matcher)
+            continue
+        start, end = anchors[i], min(i + 3, len(tokens))
+        if segments and start <= segments[-1][1]:
+            segments[-1][1] = max(segments[-1][1], end)
+        else:
+            segments.append([start, end])
+
+    if not segments:
+        return
+    with instrumentation.stage('pos_tag', items=sum(end - start for start, end in segments)):
+        tagged_segments = tagger.tag_sents([tokens[start:end] for start, end in segments])
+    # Only the requested positions are exact; words near a segment's end lack right context
+    wanted = set(positions)
+    for (start, _), tagged in zip(segments, tagged_segments):
+        for offset, (word, pos) in enumerate(tagged):
+            if start + offset in wanted and start + offset not in keep:
+                keep[start + offset] = is_relevant_word(word, pos, matcher)
+
+# POS filtering that only tags tokens able to change extract_cs_keywords' result:
+#   - stopwords, single characters and months are dropped without tagging
+#   - dictionary words, partial matches and phrase words are kept or dropped by their tag
+#   - any other word can only matter by separating two kept words that form part of a
+#     multi-word keyword, so it is tagged there and dropped everywhere else
+def _keyword_first_filter(tokens: List[str], stop_words: frozenset, tagger,
+                          matcher: KeywordMatcher) -> List[str]:
+    lowered = [token.lower() for token in tokens]
+    survivors = [
+        i for i in range(len(tokens))
+        if lowered[i] not in stop_words and len(tokens[i]) > 1 and lowered[i] not in MONTHS
+    ]
+    candidates = [
+        i for i in survivors
+        if lowered[i] in matcher.phrase_words or lowered[i] in matcher.keywords
+        or (len(lowered[i]) >= 4 and lowered[i] in matcher.fragments)
+    ]
+    if not candidates:
+        return []
+
+    # Start of the shortest exact tagging segment for each position
+    tagdict = tagger.tagdict
+    anchors = []
+    anchor = 0
+    for i in range(len(tokens)):
+        if i >= 2 and tokens[i - 1] in tagdict and tokens[i - 2] in tagdict:
+            anchor = i - 2
+        anchors.append(anchor)
+
+    keep = {}
+    _decide_by_tag(tokens, candidates, anchors, tagger, matcher, keep)
+    kept = [i for i in candidates if keep[i]]
+
+    # Words between consecutive kept candidates that could join into a phrase
+    phrase_pairs = get_phrase_pairs(matcher)
+    survivor_index = {i: position for position, i in enumerate(survivors)}
+    gaps = []
+    for left, right in zip(kept, kept[1:]):
+        if (lowered[left], lowered[right]) in phrase_pairs:
+            gaps.extend(survivors[survivor_index[left] + 1:survivor_index[right]])
+    gaps = [i for i in gaps if i not in keep]
+    _decide_by_tag(tokens, gaps, anchors, tagger, matcher, keep)
+
+    return [lowered[i] for i in sorted(kept + gaps) if keep[i]]
 
-# Remove stopwords from tokens with optional POS filtering
-def remove_stopwords(tokens: List[str], language: str = 'english', filter_pos: bool = True) -> List[str]:
-    stop_words = set(stopwords.words(language))
+# Remove stopwords from tokens with optional POS filtering.
+# keyword_first only keeps (and POS-tags) tokens that can affect extract_cs_keywords, so
+# extract_cs_keywords gives the same result on either output while tagging far fewer tokens.
+def remove_stopwords(tokens: List[str], language: str = 'english', filter_pos: bool = True,
+                     keyword_first: bool = False) -> List[str]:
+    stop_words = get_stop_words(language)
     
     # Get POS tags if filtering
-    if filter_pos:
-        tagged = pos_tag(tokens)
+    if filter_pos and keyword_first:
+        return _keyword_first_filter(tokens, stop_words, get_pos_tagger(), get_cs_matcher())
+    elif filter_pos:
+        nltk_resources.require('averaged_perceptron_tagger')
+        with instrumentation.stage('pos_tag', items=len(tokens)):
+            tagged = nltk_resources.timed_import('nltk.tag').pos_tag(tokens)
+        matcher = get_cs_matcher()
         filtered = []
         for word, pos in tagged:
             word_lower = word.lower()
             if (word_lower not in stop_words and 
                 len(word) > 1 and 
-                is_relevant_word(word, pos)):
+                is_relevant_word(word, pos, matcher)):
                 filtered.append(word_lower)
         return filtered
     else:
         return [token.lower() for token in tokens if token.lower() not in stop_words and len(token) > 1]
 
+# Only dictionary hits are returned, so POS filtering can use the keyword-first path
 def tokenize_and_remove_stopwords(text: str, language: str = 'english', 
-                                  cs_only: bool = True, filter_pos: bool = True) -> List[str]:
+                                  cs_only: bool = True, filter_pos: bool = True,
+                                  keyword_first: bool = True) -> List[str]:
     tokens = tokenize(text)
-    filtered = remove_stopwords(tokens, language, filter_pos)
+    filtered = remove_stopwords(tokens, language, filter_pos, keyword_first)
     
     cs_tokens = extract_cs_keywords(filtered)
     return cs_tokens
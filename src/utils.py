@@ -1,4 +1,5 @@
 import os
+import glob
 from typing import List
 
 # Load a single text file.
@@ -30,3 +31,16 @@ def list_files_in_directory(directory: str, extension: str = "pdf") -> List[str]
     except Exception as e:
         print(f"Error listing directory {directory}: {e}")
         return []
+
+# Resolve a directory or glob pattern to a sorted list of files.
+# For a directory, the first extension with any matches wins (e.g. PDFs before text files).
+def resolve_input_files(path_or_pattern: str, extensions: List[str] = ('.pdf', '.txt')) -> List[str]:
+    if os.path.isdir(path_or_pattern):
+        for extension in extensions:
+            files = list_files_in_directory(path_or_pattern, extension)
+            if files:
+                return files
+        return []
+    if os.path.isfile(path_or_pattern):
+        return [path_or_pattern]
+    return sorted(f for f in glob.glob(path_or_pattern) if os.path.isfile(f))
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from src.aggregation import KeywordAggregates, aggregate_by_group
+from main import analyze_keyword_frequency
+
+class TestKeywordAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = sp.random(60, 25, density=0.3, format='csr', random_state=2)
+        self.feature_names = [f"term{i}" for i in range(25)]
+
+    def test_statistics_match_numpy(self):
+        """Test column-wise statistics against np.mean/median/max/percentile of each column"""
+        aggregates = KeywordAggregates.from_tfidf(self.matrix, self.feature_names, percentiles=(10, 33, 90))
+        dense = self.matrix.toarray()
+        for column in range(25):
+            scores = dense[:, column][dense[:, column] > 0]
+            self.assertEqual(aggregates.frequency[column], len(scores))
+            if len(scores):
+                np.testing.assert_allclose(
+                    [aggregates.mean[column], aggregates.median[column], aggregates.maximum[column],
+                     aggregates.percentiles[33][column], aggregates.percentiles[90][column]],
+                    [scores.mean(), np.median(scores), scores.max(),
+                     np.percentile(scores, 33), np.percentile(scores, 90)])
+
+        ranked = [(stats['frequency'], stats['avg_score']) for stats in aggregates.to_dict().values()]
+        self.assertEqual(ranked, sorted(ranked, key=lambda x: (-x[0], -x[1])))
+
+    def test_groups_match_row_subsets(self):
+        """Test grouping by a metadata field and by a function of the metadata"""
+        metadata = [{'team': ['data', 'web', None][i % 3], 'date': f"2024-0{1 + i % 2}-15"} for i in range(60)]
+        by_team = aggregate_by_group(self.matrix, self.feature_names, metadata, 'team')
+        self.assertEqual(list(by_team), ['data', 'web', None])
+        for offset, team in enumerate(['data', 'web', None]):
+            expected = KeywordAggregates.from_tfidf(self.matrix[offset::3], self.feature_names)
+            self.assertEqual(by_team[team].n_documents, 20)
+            np.testing.assert_array_equal(by_team[team].frequency, expected.frequency)
+            np.testing.assert_allclose(by_team[team].median, expected.median)
+
+        by_month = aggregate_by_group(self.matrix, self.feature_names, metadata, lambda meta: meta['date'][:7])
+        self.assertEqual(sorted(by_month), ['2024-01', '2024-02'])
+        with self.assertRaises(ValueError):
+            aggregate_by_group(self.matrix, self.feature_names, metadata[:10], 'team')
+
+    def test_keyword_lists(self):
+        """Test analyze_keyword_frequency on per-resume keyword lists"""
+        result = analyze_keyword_frequency([[('python', 0.5), ('sql', 0.2)], [('python', 0.3)], []])
+        self.assertEqual(list(result), ['python', 'sql'])
+        self.assertEqual(result['python']['frequency'], 2)
+        self.assertAlmostEqual(result['python']['avg_score'], 0.4)
+        self.assertAlmostEqual(result['python']['max_score'], 0.5)
+        self.assertEqual(analyze_keyword_frequency([]), {})
+
+if __name__ == '__main__':
+    unittest.main()
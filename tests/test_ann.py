@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from src.ann import RandomProjectionIndex
+from src.similarity import JobMatcher
+
+class TestRandomProjectionIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Resumes clustered around a few centres, so near neighbours exist
+        rng = np.random.default_rng(0)
+        centres = rng.random((5, 200)) * (rng.random((5, 200)) < 0.1)
+        labels = rng.integers(0, 5, 1000)
+        noise = sp.random(1000, 200, density=0.02, random_state=1).toarray()
+        self.resumes = normalize(sp.csr_matrix(centres[labels] + 0.3 * noise))
+        self.centres = normalize(sp.csr_matrix(centres))
+
+    def test_scores_are_exact_cosine(self):
+        """Test that shortlisted resumes are scored with the exact cosine"""
+        index = RandomProjectionIndex(n_tables=4, n_bits=8).fit(self.resumes)
+        query = self.centres[0]
+        exact = (self.resumes @ query.T).toarray()[:, 0]
+        for row, score in index.search(query, k=20):
+            self.assertAlmostEqual(score, exact[row])
+
+    def test_recall_on_clustered_data(self):
+        """Test that the shortlist recovers most of the exact top-k"""
+        index = RandomProjectionIndex(n_tables=8, n_bits=8).fit(self.resumes)
+        for centre in range(5):
+            query = self.centres[centre]
+            exact = np.argsort(-(self.resumes @ query.T).toarray()[:, 0], kind='stable')[:20]
+            found = [row for row, _ in index.search(query, k=20)]
+            self.assertGreaterEqual(len(set(found) & set(exact.tolist())), 18)
+
+    def test_max_candidates_caps_shortlist(self):
+        """Test that max_candidates bounds the number of exactly scored resumes"""
+        index = RandomProjectionIndex(n_tables=8, n_bits=4).fit(self.resumes)
+        self.assertLessEqual(len(index.shortlist(self.centres[0], max_candidates=50)), 50)
+
+    def test_non_positive_k_is_rejected(self):
+        """Test that search refuses k <= 0"""
+        index = RandomProjectionIndex(n_tables=4, n_bits=8).fit(self.resumes)
+        for k in (0, -1):
+            with self.assertRaises(ValueError):
+                index.search(self.centres[0], k=k)
+
+    def test_job_matcher_top_matches_with_index(self):
+        """Test that JobMatcher.top_matches agrees with exhaustive scoring on the shortlist"""
+        resumes = ["python machine learning tensorflow", "java spring backend", "python flask backend"]
+        matcher = JobMatcher(ngram_range=(1, 1)).fit(resumes)
+        exhaustive = matcher.top_matches("python backend developer", k=2)
+        approximate = matcher.top_matches("python backend developer", k=2,
+                                          ann_index=matcher.build_ann_index(n_tables=16, n_bits=2))
+        self.assertEqual([m['resume'] for m in approximate], [m['resume'] for m in exhaustive])
+        self.assertEqual(approximate[0]['breakdown'], exhaustive[0]['breakdown'])
+
+if __name__ == '__main__':
+    unittest.main()
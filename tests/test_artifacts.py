@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+import numpy as np
+from src.artifacts import CorpusArtifact
+from src.similarity import JobMatcher
+from src.tfidf_vectorizer import compute_tfidf, transform_documents
+
+RESUMES = [
+    "python machine learning tensorflow deep learning neural networks data science",
+    "python flask django rest api web development backend",
+    "javascript react angular vue frontend web development",
+]
+JOBS = [
+    "python machine learning tensorflow neural networks data science",
+    "react frontend web development javascript",
+]
+
+class TestCorpusArtifact(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = os.path.join(temp_dir.name, 'corpus')
+
+    def test_matcher_round_trip(self):
+        """Test that a loaded matcher is memory-mapped and scores exactly like the fitted one"""
+        matcher = JobMatcher(ngram_range=(1, 2)).fit(RESUMES)
+        matcher.save(self.directory, resume_ids=['a', 'b', 'c'])
+        loaded = JobMatcher.load(self.directory)
+
+        self.assertIsInstance(loaded.resume_matrix.data, np.memmap)
+        self.assertEqual(loaded.resume_ids, ['a', 'b', 'c'])
+        np.testing.assert_array_equal(loaded.score(JOBS), matcher.score(JOBS))
+        self.assertEqual(loaded.top_matches(JOBS[0], k=2), matcher.top_matches(JOBS[0], k=2))
+
+    def test_tfidf_round_trip_and_overwrite(self):
+        """Test saving compute_tfidf output, including restored names, over an older artifact"""
+        JobMatcher().fit(RESUMES[:1]).save(self.directory)
+        matrix, feature_names, vectorizer, stem_mapping = compute_tfidf(RESUMES)
+        CorpusArtifact.from_tfidf(matrix, vectorizer, stem_mapping).save(self.directory)
+        artifact = CorpusArtifact.load(self.directory, mmap=False)
+
+        self.assertEqual(artifact.feature_names, list(feature_names))
+        self.assertEqual((artifact.tfidf_matrix != matrix).nnz, 0)
+        job_vectors = transform_documents(artifact.build_vectorizer(), JOBS)
+        self.assertEqual((job_vectors != transform_documents(vectorizer, JOBS)).nnz, 0)
+        self.assertEqual(os.listdir(os.path.dirname(self.directory)), ['corpus'])
+
+    def test_saves_publish_new_versions(self):
+        """Test that a save publishes a complete new version and an open corpus stays readable"""
+        matcher = JobMatcher().fit(RESUMES)
+        matcher.save(self.directory)
+        opened = JobMatcher.load(self.directory)
+        expected = opened.score(JOBS)
+        for _ in range(3):
+            JobMatcher().fit(RESUMES[:2]).save(self.directory)
+
+        versions = [entry for entry in os.listdir(self.directory) if entry.startswith('corpus-')]
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(JobMatcher.load(self.directory).resume_matrix.shape[0], 2)
+        np.testing.assert_array_equal(opened.score(JOBS), expected)
+
+    def test_rejects_other_format_versions(self):
+        """Test that artifacts written with another layout version are refused"""
+        JobMatcher().fit(RESUMES).save(self.directory)
+        with open(os.path.join(self.directory, 'CURRENT'), encoding='utf-8') as f:
+            version = f.read()
+        with open(os.path.join(self.directory, version, 'meta.json'), 'r+', encoding='utf-8') as f:
+            meta = json.load(f)
+            meta['format'] = 0
+            f.seek(0)
+            json.dump(meta, f)
+            f.truncate()
+        with self.assertRaises(ValueError):
+            JobMatcher.load(self.directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from src.cache import DocumentCache
+from src import tokenizer
+
+class TestDocumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.doc_path = os.path.join(self.tmp.name, 'resume.txt')
+        with open(self.doc_path, 'w', encoding='utf-8') as f:
+            f.write("python developer")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test that stored entries are returned for the same file and options"""
+        cache = DocumentCache(self.cache_dir)
+        key = cache.make_key(self.doc_path, filter_pos=True)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {'cleaned_text': 'python developer', 'tokens': ['python']})
+        self.assertEqual(cache.get(key)['tokens'], ['python'])
+
+    def test_key_depends_on_content_and_config(self):
+        """Test that content or option changes produce a new key"""
+        cache = DocumentCache(self.cache_dir)
+        key = cache.make_key(self.doc_path, filter_pos=True)
+        self.assertNotEqual(key, cache.make_key(self.doc_path, filter_pos=False))
+        with open(self.doc_path, 'w', encoding='utf-8') as f:
+            f.write("java developer")
+        self.assertNotEqual(key, cache.make_key(self.doc_path, filter_pos=True))
+
+    def test_keyword_dictionary_change_purges_entries(self):
+        """Test that extending CS_KEYWORDS invalidates the cache"""
+        cache = DocumentCache(self.cache_dir)
+        key = cache.make_key(self.doc_path)
+        cache.put(key, {'cleaned_text': '', 'tokens': []})
+        tokenizer.CS_KEYWORDS.add('zig')
+        try:
+            DocumentCache(self.cache_dir)
+            self.assertEqual(os.listdir(self.cache_dir), [])
+        finally:
+            tokenizer.CS_KEYWORDS.discard('zig')
+
+    def test_older_format_entries_are_purged(self):
+        """Test that entries written by an older cache format are not served"""
+        cache = DocumentCache(self.cache_dir)
+        old_entry = f"{cache.dictionary_version}-{'0' * 64}.json"
+        with open(os.path.join(self.cache_dir, old_entry), 'w', encoding='utf-8') as f:
+            f.write('{"cleaned_text": "stale", "tokens": []}')
+        key = cache.make_key(self.doc_path)
+        cache.put(key, {'cleaned_text': '', 'tokens': []})
+        DocumentCache(self.cache_dir)
+        self.assertEqual(os.listdir(self.cache_dir), [key + '.json'])
+
+    def test_eviction_respects_size_bound(self):
+        """Test that least recently used entries are evicted past max_bytes"""
+        cache = DocumentCache(self.cache_dir, max_bytes=200)
+        for idx in range(10):
+            cache.put(f"{idx:02d}", {'cleaned_text': 'x' * 50, 'tokens': []})
+        cache.evict()
+        total = sum(os.path.getsize(os.path.join(self.cache_dir, f)) for f in os.listdir(self.cache_dir))
+        self.assertLessEqual(total, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import csv
+import json
+import unittest
+from src.output import open_writer
+from main import select_job, build_parser, iter_batch_matches
+
+ROW = {
+    'job': 'job1.txt', 'resume': 'a.pdf', 'similarity': 0.25, 'match_quality': 'Moderate match',
+    'top_keywords': ['python'], 'found_keywords': ['python', 'sql'], 'missing_keywords': ['java'],
+}
+
+def nltk_data_available() -> bool:
+    import nltk
+    try:
+        for resource in ('tokenizers/punkt', 'corpora/stopwords', 'taggers/averaged_perceptron_tagger'):
+            nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+class TestBatchCli(unittest.TestCase):
+
+    def test_select_job_by_number_or_name(self):
+        """Test non-interactive job selection"""
+        jobs = ['assets/jobs/job1.txt', 'assets/jobs/job2.txt']
+        self.assertEqual(select_job(jobs, '2'), jobs[1])
+        self.assertEqual(select_job(jobs, 'job1.txt'), jobs[0])
+        self.assertEqual(select_job(jobs[:1]), jobs[0])
+        self.assertIsNone(select_job(jobs, 'job9.txt'))
+
+    def test_job_and_all_jobs_are_exclusive(self):
+        """Test that --job and --all-jobs cannot be combined"""
+        with self.assertRaises(SystemExit):
+            build_parser().parse_args(['--job', '1', '--all-jobs'])
+
+    def test_structured_writers(self):
+        """Test JSON Lines and CSV rows"""
+        stream = io.StringIO()
+        open_writer('jsonl', stream).write(ROW)
+        self.assertEqual(json.loads(stream.getvalue()), ROW)
+
+        stream = io.StringIO()
+        open_writer('csv', stream).write(ROW)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(rows[0]['found_keywords'], 'python;sql')
+        self.assertEqual(float(rows[0]['similarity']), 0.25)
+
+    @unittest.skipUnless(nltk_data_available(), "NLTK data not installed")
+    def test_all_jobs_against_all_resumes(self):
+        """Test that every job is scored against every resume"""
+        root = os.path.join(os.path.dirname(__file__), '..', 'assets')
+        resumes = sorted(os.path.join(root, 'resumes', f) for f in os.listdir(os.path.join(root, 'resumes')))
+        jobs = sorted(os.path.join(root, 'jobs', f) for f in os.listdir(os.path.join(root, 'jobs')))
+        rows = list(iter_batch_matches(resumes, jobs))
+        self.assertEqual(len(rows), len(resumes) * len(jobs))
+        self.assertTrue(all(0 <= row['similarity'] <= 1 for row in rows))
+
+if __name__ == '__main__':
+    unittest.main()
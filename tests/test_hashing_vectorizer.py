@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.hashing_vectorizer import HashingTfidfVectorizer, compute_hashed_tfidf
+from src.tfidf_vectorizer import compute_tfidf, iter_tfidf_scores
+from src.keyword_extractor import extract_top_keywords
+from src.similarity import compute_similarity_with_breakdown
+
+DOCUMENTS = [
+    "python developer building machine learning pipelines",
+    "java developer building backend services",
+    "machine learning engineer using python and tensorflow",
+    "frontend engineer using react and typescript",
+    "data engineer building spark pipelines in python",
+]
+
+class TestHashingTfidfVectorizer(unittest.TestCase):
+
+    def assert_same_scores(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            self.assertEqual(set(a), set(e))
+            for keyword, score in e.items():
+                self.assertAlmostEqual(a[keyword], score, places=10)
+
+    def test_matches_vocabulary_tfidf(self):
+        """Test that, without collisions, hashed weights and names match compute_tfidf"""
+        matrix, feature_names, _, _ = compute_tfidf(DOCUMENTS)
+        hashed, hashed_names, _, _ = compute_hashed_tfidf(DOCUMENTS, n_features=2 ** 24)
+        self.assert_same_scores(list(iter_tfidf_scores(hashed, hashed_names)),
+                                list(iter_tfidf_scores(matrix, feature_names)))
+
+    def test_chunked_fit_matches_single_fit(self):
+        """Test that partial IDF accumulation over chunks equals fitting all documents at once"""
+        whole = HashingTfidfVectorizer(n_features=2 ** 10).fit(DOCUMENTS, chunk_size=len(DOCUMENTS))
+        chunked = HashingTfidfVectorizer(n_features=2 ** 10).fit(iter(DOCUMENTS), chunk_size=2)
+        self.assertEqual(chunked.n_documents, 5)
+        np.testing.assert_array_equal(chunked.document_frequency, whole.document_frequency)
+        np.testing.assert_allclose(chunked.transform(DOCUMENTS).toarray(), whole.transform(DOCUMENTS).toarray())
+
+    def test_readable_keywords(self):
+        """Test that top keywords and the similarity breakdown report n-grams, not columns"""
+        matrix, feature_names, vectorizer, _ = compute_hashed_tfidf(DOCUMENTS, n_features=2 ** 16)
+        self.assertEqual(feature_names[vectorizer.column('tensorflow')], 'tensorflow')
+        top = extract_top_keywords(next(iter_tfidf_scores(matrix[2:3], feature_names)), 3)
+        self.assertTrue(all(isinstance(keyword, str) for keyword, _ in top))
+
+        expected = compute_similarity_with_breakdown(DOCUMENTS[:4], DOCUMENTS[4])
+        results = compute_similarity_with_breakdown(DOCUMENTS[:4], DOCUMENTS[4], n_features=2 ** 24)
+        for result, reference in zip(results, expected):
+            self.assertAlmostEqual(result['similarity'], reference['similarity'])
+            self.assertEqual({b[0] for b in result['breakdown']}, {b[0] for b in reference['breakdown']})
+
+if __name__ == '__main__':
+    unittest.main()
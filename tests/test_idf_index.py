@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from src.idf_index import IncrementalTfidfIndex
+from src.tfidf_vectorizer import compute_tfidf, get_tfidf_scores
+
+DOCUMENTS = [
+    "python machine learning tensorflow python",
+    "java spring backend developer java",
+    "python developer machine learning engineer",
+]
+
+class TestIncrementalTfidfIndex(unittest.TestCase):
+
+    def build(self, documents, **kwargs):
+        index = IncrementalTfidfIndex(**kwargs)
+        for idx, doc in enumerate(documents):
+            index.add_document(str(idx), doc)
+        return index
+
+    def test_matches_full_fit(self):
+        """Test that incremental weights equal compute_tfidf on the same documents"""
+        index = self.build(DOCUMENTS, ngram_range=(1, 2), use_stemming=False)
+        tfidf_matrix, feature_names, _, _ = compute_tfidf(DOCUMENTS, ngram_range=(1, 2), use_stemming=False)
+        for idx in range(len(DOCUMENTS)):
+            expected = get_tfidf_scores(tfidf_matrix, feature_names, idx)
+            actual = index.vectorize(str(idx))
+            self.assertEqual(set(actual), set(expected))
+            for term, score in expected.items():
+                self.assertAlmostEqual(actual[term], score)
+
+    def test_add_then_remove_restores_state(self):
+        """Test that removing a document undoes its document frequencies"""
+        index = self.build(DOCUMENTS[:2])
+        before = {doc_id: index.vectorize(doc_id) for doc_id in ('0', '1')}
+        index.add_document('new', DOCUMENTS[2])
+        self.assertNotEqual(index.vectorize('0'), before['0'])
+        index.remove_document('new')
+        self.assertEqual({doc_id: index.vectorize(doc_id) for doc_id in ('0', '1')}, before)
+
+    def test_top_keywords_are_readable(self):
+        """Test that stemmed features are reported in their original form"""
+        index = self.build(DOCUMENTS, ngram_range=(1, 1))
+        keywords = [kw for kw, _ in index.top_keywords('0', top_n=3)]
+        self.assertIn('tensorflow', keywords)
+        self.assertIn('python', keywords)
+
+    def test_snapshot_round_trip(self):
+        """Test that a saved index reloads with identical weights"""
+        index = self.build(DOCUMENTS)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'index.json')
+            index.save(path)
+            loaded = IncrementalTfidfIndex.load(path)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.vectorize('2'), index.vectorize('2'))
+        self.assertEqual(loaded.top_keywords('2'), index.top_keywords('2'))
+
+if __name__ == '__main__':
+    unittest.main()
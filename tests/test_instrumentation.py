@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import unittest
+import numpy as np
+from src import instrumentation
+from src.pipeline import process_documents
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.enable(False)
+        instrumentation.reset()
+
+    def test_disabled_records_nothing(self):
+        """Test that stages are free no-ops unless instrumentation is enabled"""
+        with instrumentation.stage('tokenize'):
+            pass
+        self.assertEqual(instrumentation.get_events(), [])
+
+    def test_summary_and_chrome_trace(self):
+        """Test per-stage totals and the trace-event JSON"""
+        instrumentation.enable()
+        for _ in range(3):
+            with instrumentation.stage('tokenize', items=2):
+                sum(range(1000))
+        with instrumentation.stage('keyword_matching') as info:
+            info['items'] = 5
+
+        summary = instrumentation.summarize()
+        self.assertEqual(summary['tokenize']['calls'], 3)
+        self.assertEqual(summary['tokenize']['items'], 6)
+        self.assertEqual(summary['keyword_matching']['items'], 5)
+        self.assertGreaterEqual(summary['tokenize']['wall'], 0)
+        self.assertIn('keyword_matching', instrumentation.format_summary())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            instrumentation.write_chrome_trace(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                trace = json.load(f)
+        self.assertEqual(len(trace['traceEvents']), 4)
+        self.assertTrue(all(event['ph'] == 'X' for event in trace['traceEvents']))
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), "needs the current RSS from /proc")
+    def test_memory_is_attributed_to_the_growing_stage(self):
+        """Test that only the stage that raises the process peak reports RSS growth"""
+        instrumentation.enable()
+        with open('/proc/self/statm') as f:
+            current_mb = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+        # Enough to lift the process 64 MB past its previous peak
+        size = int((instrumentation.process_peak_rss_mb() - current_mb + 64) * 1e6)
+        with instrumentation.stage('allocate'):
+            block = np.ones(size, dtype=np.uint8)
+        del block
+        with instrumentation.stage('small'):
+            sum(range(1000))
+
+        summary = instrumentation.summarize()
+        self.assertGreater(summary['allocate']['rss_growth_mb'], 32)
+        self.assertLess(summary['small']['rss_growth_mb'], 1)
+        self.assertEqual(summary['small']['process_peak_rss_mb'], summary['allocate']['process_peak_rss_mb'])
+
+    def test_worker_events_reach_parent(self):
+        """Test that stages recorded in worker processes are merged into the parent's events"""
+        instrumentation.enable()
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(2):
+                path = os.path.join(tmp, f'resume{i}.txt')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write("python developer with java experience")
+                paths.append(path)
+            process_documents(paths, workers=2)
+
+        events = [event for event in instrumentation.get_events() if event['name'] == 'process_document']
+        self.assertEqual(len(events), 2)
+        self.assertNotIn(os.getpid(), {event['pid'] for event in events})
+
+if __name__ == '__main__':
+    unittest.main()
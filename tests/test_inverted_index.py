@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from sklearn.metrics.pairwise import cosine_similarity
+from src.inverted_index import InvertedIndex
+from src.tfidf_vectorizer import compute_tfidf, transform_documents
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def test_top_k_matches_exhaustive_cosine(self):
+        """Test that pruned retrieval returns the exact top-k cosine scores"""
+        resumes = normalize(sp.random(500, 300, density=0.05, format='csr', random_state=0))
+        index = InvertedIndex(resumes)
+        for seed in range(10):
+            query = normalize(sp.random(1, 300, density=0.1, format='csr', random_state=100 + seed))
+            exact = cosine_similarity(resumes, query)[:, 0]
+            expected = sorted(((score, -row) for row, score in enumerate(exact) if score > 0), reverse=True)[:20]
+
+            results = index.search(query, k=20)
+            self.assertEqual([row for row, _ in results], [-row for _, row in expected])
+            np.testing.assert_allclose([score for _, score in results], [score for score, _ in expected])
+
+    def test_search_text_uses_resume_ids(self):
+        """Test retrieval from raw texts with the fitted vectorizer"""
+        resumes = ["python machine learning tensorflow", "java spring backend", "python flask backend"]
+        index = InvertedIndex.from_documents(resumes, resume_ids=['a', 'b', 'c'], ngram_range=(1, 2))
+        results = index.search_text("python machine learning", k=2)
+        self.assertEqual([resume_id for resume_id, _ in results], ['a', 'c'])
+
+        tfidf_matrix, _, vectorizer, _ = compute_tfidf(resumes, ngram_range=(1, 2))
+        job_vector = transform_documents(vectorizer, ["python machine learning"])
+        self.assertAlmostEqual(results[0][1], cosine_similarity(tfidf_matrix[0], job_vector)[0, 0])
+
+    def test_non_positive_k_is_rejected(self):
+        """Test that search refuses k <= 0"""
+        index = InvertedIndex(normalize(sp.random(10, 20, density=0.3, format='csr', random_state=0)))
+        query = normalize(sp.random(1, 20, density=0.3, format='csr', random_state=1))
+        for k in (0, -1):
+            with self.assertRaises(ValueError):
+                index.search(query, k=k)
+
+if __name__ == '__main__':
+    unittest.main()
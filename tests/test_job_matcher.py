@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+from src.similarity import JobMatcher, get_similarity_breakdown, get_similarity_breakdowns
+
+RESUMES = [
+    "python machine learning tensorflow deep learning neural networks data science",
+    "python flask django rest api web development backend",
+    "javascript react angular vue frontend web development",
+]
+JOBS = [
+    "python machine learning tensorflow neural networks data science",
+    "react frontend web development javascript",
+    "rust embedded systems",
+]
+
+class TestJobMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = JobMatcher(ngram_range=(1, 2)).fit(RESUMES)
+
+    def test_score_matrix_shape_and_values(self):
+        """Test that scoring returns a resumes x jobs cosine matrix"""
+        scores = self.matcher.score(JOBS)
+        self.assertEqual(scores.shape, (3, 3))
+        expected = cosine_similarity(self.matcher.resume_matrix, self.matcher.transform_jobs(JOBS))
+        np.testing.assert_allclose(scores, expected)
+        self.assertEqual(int(np.argmax(scores[:, 0])), 0)
+        self.assertEqual(int(np.argmax(scores[:, 1])), 2)
+
+    def test_stream_matches_batch(self):
+        """Test that streamed scoring gives the same columns as one batch"""
+        streamed = np.column_stack(list(self.matcher.score_stream(iter(JOBS), batch_size=2)))
+        np.testing.assert_allclose(streamed, self.matcher.score(JOBS))
+
+    def test_breakdown(self):
+        """Test that breakdown contributions sum to the similarity"""
+        results = self.matcher.score_with_breakdown(JOBS[0], top_n=100)
+        for result in results:
+            total = sum(contribution for _, _, _, contribution in result['breakdown'])
+            self.assertAlmostEqual(total, result['similarity'])
+
+    def test_requires_fit(self):
+        """Test that scoring before fitting raises"""
+        with self.assertRaises(ValueError):
+            JobMatcher().score(JOBS)
+
+    def test_non_positive_k_is_rejected(self):
+        """Test that top_matches refuses k <= 0"""
+        for k in (0, -1):
+            with self.assertRaises(ValueError):
+                self.matcher.top_matches(JOBS[0], k=k)
+
+class TestSimilarityBreakdown(unittest.TestCase):
+
+    def reference_breakdown(self, row, job, feature_names, top_n):
+        contributions = []
+        for idx, feature in enumerate(feature_names):
+            contribution = row[idx] * job[idx]
+            if contribution > 0:
+                contributions.append((feature, row[idx], job[idx], contribution))
+        contributions.sort(key=lambda x: x[3], reverse=True)
+        return contributions[:top_n]
+
+    def test_matches_feature_loop(self):
+        """Test batched breakdowns against the per-feature loop, including ties"""
+        rng = np.random.default_rng(0)
+        # Few distinct values so the top-n cutoff often falls on ties
+        resumes = sp.random(30, 200, density=0.3, format='csr', random_state=1,
+                            data_rvs=lambda n: rng.integers(1, 4, n) / 4)
+        job = sp.random(1, 200, density=0.5, format='csr', random_state=2,
+                        data_rvs=lambda n: rng.integers(1, 3, n) / 2)
+        feature_names = [f"term{i}" for i in range(200)]
+
+        breakdowns = get_similarity_breakdowns(resumes, job, feature_names, top_n=5)
+        dense_resumes, dense_job = resumes.toarray(), job.toarray()[0]
+        for row in range(30):
+            expected = self.reference_breakdown(dense_resumes[row], dense_job, feature_names, 5)
+            self.assertEqual(breakdowns[row], expected)
+
+    def test_zero_top_n(self):
+        """Test that top_n=0 gives empty breakdowns instead of failing"""
+        resumes = sp.random(5, 20, density=0.5, format='csr', random_state=1)
+        job = sp.random(1, 20, density=0.5, format='csr', random_state=2)
+        breakdowns = get_similarity_breakdowns(resumes, job, [f"term{i}" for i in range(20)], top_n=0)
+        self.assertEqual(breakdowns, [[]] * 5)
+
+    def test_dense_vectors(self):
+        """Test that a single pair of dense vectors is still accepted"""
+        breakdown = get_similarity_breakdown(np.array([0.5, 0.0, 0.5]), np.array([1.0, 1.0, 0.0]),
+                                             ['a', 'b', 'c'])
+        self.assertEqual(breakdown, [('a', 0.5, 1.0, 0.5)])
+
+if __name__ == '__main__':
+    unittest.main()
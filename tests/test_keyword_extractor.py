@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from src.keyword_extractor import (extract_top_keywords, extract_top_keywords_from_matrix,
+                                   iter_top_k_positions, iter_top_keywords, top_k_positions)
+from src.tfidf_vectorizer import iter_tfidf_scores
+
+class TestTopKeywords(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = sp.random(40, 30, density=0.4, format='csr', random_state=1)
+        self.matrix.data = np.round(self.matrix.data, 1)  # plenty of ties
+        self.matrix.data[self.matrix.indptr[5]:self.matrix.indptr[6]] = 0  # an empty document
+        self.matrix.eliminate_zeros()
+        self.feature_names = [f"term{i}" for i in range(30)]
+        self.dicts = list(iter_tfidf_scores(self.matrix, self.feature_names))
+
+    def test_dict_top_k_keeps_sorted_order(self):
+        """Test that heap selection matches a stable full sort, including ties"""
+        scores = {'b': 0.5, 'a': 0.9, 'c': 0.5, 'd': 0.1, 'e': 0.5}
+        self.assertEqual(extract_top_keywords(scores, 3), [('a', 0.9), ('b', 0.5), ('c', 0.5)])
+        self.assertEqual(extract_top_keywords(scores, 10),
+                         sorted(scores.items(), key=lambda x: x[1], reverse=True))
+
+    def test_matrix_top_k_matches_dicts(self):
+        """Test corpus-wide selection on sparse rows against per-document dict selection"""
+        for top_n in (0, 1, 4, 30):
+            expected = [extract_top_keywords(scores, top_n) for scores in self.dicts]
+            self.assertEqual(extract_top_keywords_from_matrix(self.matrix, self.feature_names, top_n), expected)
+            self.assertEqual(list(iter_top_keywords(self.matrix, self.feature_names, top_n, block_size=7)),
+                             expected)
+
+    def test_generator_and_counts(self):
+        """Test consuming documents one at a time, and per-row counts of the array form"""
+        keywords = iter_top_keywords(self.matrix, self.feature_names, top_n=3, block_size=4)
+        self.assertEqual(next(keywords), extract_top_keywords(self.dicts[0], 3))
+
+        counts, positions = top_k_positions(self.matrix.indptr, self.matrix.data, 3)
+        self.assertEqual(counts[5], 0)
+        self.assertEqual(len(positions), counts.sum())
+
+    def test_entry_budget_splits_blocks(self):
+        """Test that a long row does not widen its block, with the same selection"""
+        matrix = self.matrix.tolil()
+        matrix[3, :] = np.linspace(0.1, 0.9, 30)
+        matrix = matrix.tocsr()
+        expected = top_k_positions(matrix.indptr, matrix.data, 4)
+        lengths = np.diff(matrix.indptr)
+        for max_entries in (1, 20, 60):
+            first = 0
+            for counts, _ in iter_top_k_positions(matrix.indptr, matrix.data, 4, max_entries=max_entries):
+                padded = len(counts) * lengths[first:first + len(counts)].max()
+                self.assertTrue(len(counts) == 1 or padded <= max_entries)
+                first += len(counts)
+            self.assertEqual(first, matrix.shape[0])
+            counts, positions = top_k_positions(matrix.indptr, matrix.data, 4, max_entries=max_entries)
+            np.testing.assert_array_equal(counts, expected[0])
+            np.testing.assert_array_equal(positions, expected[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from src.tokenizer import (_keyword_first_filter, extract_cs_keywords, is_relevant_word,
+                           get_cs_matcher, tokenize, remove_stopwords, CS_KEYWORDS)
+from src.utils import list_files_in_directory
+from src.cleaner import process_document
+
+STOP_WORDS = frozenset(['the', 'and', 'with', 'for', 'a', 'of', 'in', 'on'])
+FILLER = ['team', 'built', 'quickly', 'large', 'scalable', 'worked', 'project', 'new', 'using',
+          'fast', 'led', 'january', 'x', 'tools', 'robust', 'daily']
+TAGS = ['NN', 'VB', 'JJ', 'RB', 'NNS', 'VBD']
+
+def nltk_data_available() -> bool:
+    import nltk
+    try:
+        for resource in ('tokenizers/punkt', 'corpora/stopwords', 'taggers/averaged_perceptron_tagger'):
+            nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+# Reference: tag every token, then filter (the filter_pos path of remove_stopwords)
+def tag_everything(tokens, tagger):
+    matcher = get_cs_matcher()
+    return [
+        word.lower() for word, pos in tagger.tag(tokens)
+        if word.lower() not in STOP_WORDS and len(word) > 1 and is_relevant_word(word, pos, matcher)
+    ]
+
+class TestKeywordFirstFilter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # A real perceptron tagger trained on sentences whose tags depend on context,
+        # so both tagdict lookups and context-dependent predictions are exercised
+        from nltk.tag import PerceptronTagger
+        rng = random.Random(0)
+        cls.words = sorted(CS_KEYWORDS)[:150] + [w for kw in CS_KEYWORDS if ' ' in kw for w in kw.split()] + FILLER
+        cls.words += list(STOP_WORDS)
+        fixed = {word: rng.choice(TAGS) for word in rng.sample(cls.words, len(cls.words) // 2)}
+
+        sentences = []
+        for _ in range(400):
+            sentence, previous = [], '-START-'
+            for word in (rng.choice(cls.words) for _ in range(rng.randint(5, 25))):
+                tag = fixed.get(word) or TAGS[(len(previous) * 7 + len(word)) % len(TAGS)]
+                sentence.append((word, tag))
+                previous = word
+            sentences.append(sentence)
+        cls.tagger = PerceptronTagger(load=False)
+        cls.tagger.train(sentences, nr_iter=3)
+
+    def test_same_keywords_as_tagging_everything(self):
+        """Test that keyword-first filtering gives the same extract_cs_keywords output"""
+        rng = random.Random(1)
+        matcher = get_cs_matcher()
+        phrases = sorted(kw.split() for kw in CS_KEYWORDS if ' ' in kw)
+        for _ in range(300):
+            tokens, length = [], rng.randint(0, 80)
+            while len(tokens) < length:
+                if rng.random() < 0.2:
+                    # A multi-word keyword with filler that the tagger may or may not drop
+                    for word in rng.choice(phrases):
+                        tokens.append(word)
+                        if rng.random() < 0.5:
+                            tokens.append(rng.choice(FILLER))
+                else:
+                    tokens.append(rng.choice(self.words))
+            expected = extract_cs_keywords(tag_everything(tokens, self.tagger))
+            actual = extract_cs_keywords(_keyword_first_filter(tokens, STOP_WORDS, self.tagger, matcher))
+            self.assertEqual(actual, expected)
+
+    def test_decisions_follow_the_tagger(self):
+        """Test that switching taggers does not reuse the previous tagger's decisions"""
+        from nltk.tag import PerceptronTagger
+        tokens = ['python', 'team']
+        for tag, expected in [('NN', ['python']), ('RB', []), ('NN', ['python'])]:
+            tagger = PerceptronTagger(load=False)
+            tagger.tagdict = {'python': tag, 'team': 'NN'}
+            self.assertEqual(_keyword_first_filter(tokens, STOP_WORDS, tagger, get_cs_matcher()), expected)
+
+    def test_skips_tokens_that_cannot_match(self):
+        """Test that filler words away from phrases are never returned"""
+        tokens = ['team', 'worked', 'quickly', 'python', 'the', 'daily']
+        filtered = _keyword_first_filter(tokens, STOP_WORDS, self.tagger, get_cs_matcher())
+        self.assertTrue(set(filtered) <= {'python'})
+
+    @unittest.skipUnless(nltk_data_available(), "NLTK data not installed")
+    def test_parity_on_bundled_assets(self):
+        """Test identical keywords on the bundled resumes and jobs"""
+        root = os.path.join(os.path.dirname(__file__), '..', 'assets')
+        files = (list_files_in_directory(os.path.join(root, 'resumes'), '.pdf') +
+                 list_files_in_directory(os.path.join(root, 'jobs'), '.txt'))
+        for path in files:
+            tokens = tokenize(process_document(path))
+            self.assertEqual(
+                extract_cs_keywords(remove_stopwords(tokens, keyword_first=True)),
+                extract_cs_keywords(remove_stopwords(tokens, keyword_first=False)),
+                path
+            )
+
+if __name__ == '__main__':
+    unittest.main()
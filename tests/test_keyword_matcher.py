@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import unittest
+from src.keyword_matcher import KeywordMatcher, JobKeywordMatcher, match_keywords_in_jobs
+
+ASSETS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
+
+KEYWORDS = {'python', 'scikit-learn', 'machine learning', 'deep learning',
+            'natural language processing', 'language', 'java', 'r'}
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = KeywordMatcher(KEYWORDS)
+
+    def test_exact_and_partial(self):
+        """Test exact keywords and substrings of single-word keywords"""
+        self.assertTrue(self.matcher.is_keyword('python'))
+        self.assertFalse(self.matcher.is_keyword('scikit'))
+        self.assertTrue(self.matcher.is_partial('scikit'))
+        self.assertTrue(self.matcher.is_partial('ava'))
+        self.assertFalse(self.matcher.is_partial('machine'))
+
+    def test_multi_word_terms(self):
+        """Test that multi-word terms are found once, including overlapping ones"""
+        tokens = ['machine', 'learning', 'and', 'natural', 'language', 'processing',
+                  'machine', 'learning']
+        phrases = self.matcher.find_phrases(tokens)
+        self.assertEqual(phrases, ['machine learning', 'natural language processing'])
+
+    def test_phrases_respect_token_boundaries(self):
+        """Test that phrases do not match inside longer words"""
+        self.assertEqual(self.matcher.find_phrases(['deep', 'learnings']), [])
+
+    def test_match_order(self):
+        """Test that phrases come first, then tokens in input order"""
+        tokens = ['Python', 'deep', 'learning', 'scikit', 'ava', 'r']
+        self.assertEqual(self.matcher.match(tokens),
+                         ['deep learning', 'python', 'scikit', 'r'])
+
+    def test_partial_matches_same_as_linear_scan(self):
+        """Test partial matching against a linear scan of the dictionary"""
+        single = [kw for kw in KEYWORDS if ' ' not in kw]
+        rng = random.Random(0)
+        for _ in range(500):
+            kw = rng.choice(single)
+            start = rng.randrange(len(kw))
+            token = kw[start:rng.randrange(start + 1, len(kw) + 1)] + rng.choice(['', 'x'])
+            expected = token in KEYWORDS or any(token in k for k in single)
+            self.assertEqual(self.matcher.is_partial(token), expected)
+
+class TestJobKeywordMatcher(unittest.TestCase):
+
+    def test_whole_word_matching(self):
+        """Test that single words and phrases only match whole words"""
+        keywords = [('ai', 0.5), ('machine learning', 0.4), ('go', 0.3), ('scikit learn', 0.2)]
+        matcher = JobKeywordMatcher([keywords])
+        found, missing = matcher.match("Maintain email tooling; Machine-Learning with Scikit-Learn, Google")[0]
+        self.assertEqual(found, [('machine learning', 0.4), ('scikit learn', 0.2)])
+        self.assertEqual(missing, [('ai', 0.5), ('go', 0.3)])
+
+    def test_symbol_keywords(self):
+        """Test that c++, c# and .net match only themselves"""
+        keywords = [('c++', 0.5), ('c#', 0.4), ('.net', 0.3), ('c', 0.2), ('node.js', 0.1)]
+        matcher = JobKeywordMatcher([keywords])
+        found, missing = matcher.match("Write C in embedded code. Tools: Node.js.")[0]
+        self.assertEqual(found, [('c', 0.2), ('node.js', 0.1)])
+        found, missing = matcher.match("Senior C++/C# developer for our .NET platform.")[0]
+        self.assertEqual(found, [('c++', 0.5), ('c#', 0.4), ('.net', 0.3)])
+        with self.assertRaises(ValueError):
+            JobKeywordMatcher([[('++', 1.0)]])
+
+    def test_dotted_words_match_by_parts(self):
+        """Test that cleaned resume keywords are found inside Node.js and Vue.js in job2.txt"""
+        with open(os.path.join(ASSETS, 'jobs', 'job2.txt'), 'r', encoding='utf-8') as f:
+            job_text = f.read()
+        keywords = [('node', 1.0), ('vue', 0.5), ('js', 0.3), ('node.js', 0.2), ('node js', 0.1)]
+        found, missing = JobKeywordMatcher([keywords]).match(job_text)[0]
+        self.assertEqual(found, keywords)
+        self.assertEqual(missing, [])
+
+    def test_many_lists_many_jobs(self):
+        """Test found/missing for every keyword list against every job"""
+        lists = [[('python', 1.0), ('docker', 0.5)], [('react', 1.0)]]
+        results = match_keywords_in_jobs(lists, ["Python and Docker", "React frontend"])
+        self.assertEqual(results[0][0], ([('python', 1.0), ('docker', 0.5)], []))
+        self.assertEqual(results[0][1], ([], [('react', 1.0)]))
+        self.assertEqual(results[1][1], ([('react', 1.0)], []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from src.keyword_scores import KeywordScores
+from src.tfidf_vectorizer import iter_tfidf_scores
+from src.keyword_extractor import extract_top_keywords, extract_top_keyword_scores
+from main import analyze_keyword_frequency
+
+class TestKeywordScores(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = sp.random(30, 40, density=0.3, format='csr', random_state=0)
+        self.matrix.data = np.round(self.matrix.data, 1)  # plenty of ties
+        # Repeated names, as when two stems restore to the same word
+        self.feature_names = [f"term{i % 35}" for i in range(40)]
+        self.dicts = list(iter_tfidf_scores(self.matrix, self.feature_names))
+        self.scores = KeywordScores.from_tfidf(self.matrix, self.feature_names)
+
+    def assert_same_keywords(self, actual, expected):
+        self.assertEqual([k for k, _ in actual], [k for k, _ in expected])
+        np.testing.assert_allclose([s for _, s in actual], [s for _, s in expected], rtol=1e-6)
+
+    def test_rows_match_score_dicts(self):
+        """Test that every document holds the same keywords, in order, as its dict"""
+        self.assertEqual(len(self.scores), 30)
+        for doc_index, expected in enumerate(self.dicts):
+            self.assert_same_keywords(list(self.scores.to_dict(doc_index).items()), list(expected.items()))
+
+    def test_top_k_matches_extract_top_keywords(self):
+        """Test vectorized per-document top-k, including tie order"""
+        top = extract_top_keyword_scores(self.scores, top_n=5)
+        for doc_index, scores in enumerate(self.dicts):
+            self.assert_same_keywords(top.keywords(doc_index), extract_top_keywords(scores, 5))
+
+    def test_frequency_matches_list_aggregation(self):
+        """Test numpy aggregation against the per-keyword list version"""
+        top = self.scores.top_k(5)
+        expected = analyze_keyword_frequency([extract_top_keywords(scores, 5) for scores in self.dicts])
+        actual = analyze_keyword_frequency(top)
+        self.assertEqual(set(actual), set(expected))
+        for keyword, stats in actual.items():
+            self.assertEqual(stats['frequency'], expected[keyword]['frequency'])
+            self.assertAlmostEqual(stats['avg_score'], expected[keyword]['avg_score'], places=6)
+
+        ranked = [(stats['frequency'], stats['avg_score']) for stats in actual.values()]
+        self.assertEqual(ranked, sorted(ranked, key=lambda x: (-x[0], -x[1])))
+
+if __name__ == '__main__':
+    unittest.main()
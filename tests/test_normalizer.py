@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import re
+import unittest
+from src.cleaner import clean_text
+from src.tokenizer import normalize_abbreviations
+
+# Previous multi-pass implementation, kept as the reference behaviour
+def reference_clean_text(text, remove_punctuation=True):
+    text = text.lower()
+    text = re.sub(r"http\S+|www\.\S+", "", text)
+    text = re.sub(r"\S*\d+\S*", "", text)
+    if remove_punctuation:
+        text = re.sub(r"[^\w\s]", " ", text)
+    else:
+        text = re.sub(r"[^\w\s\-']", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+class TestNormalizer(unittest.TestCase):
+
+    def test_clean_text_matches_reference(self):
+        """Test clean_text against the multi-pass regex version on random text"""
+        alphabet = list("htpw.:/1a- '()\n\tHTTPé_,") + ['http', 'www.', 'http://', '2', 'python']
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 14)))
+            for remove_punctuation in (True, False):
+                self.assertEqual(clean_text(text, remove_punctuation),
+                                 reference_clean_text(text, remove_punctuation), repr(text))
+
+    def test_clean_text_examples(self):
+        """Test URL, number and punctuation handling"""
+        text = "Python3 dev at https://github.com, see www.site.io (full-stack) since 2023!"
+        self.assertEqual(clean_text(text), "dev at see full stack since")
+        self.assertEqual(clean_text(text, remove_punctuation=False), "dev at see full-stack since")
+
+    def test_abbreviations_replaced_once(self):
+        """Test that each abbreviation is expanded once, in a single pass"""
+        self.assertEqual(normalize_abbreviations("B.S. in CS, MS and PhD"),
+                         "bachelor's degree. in cs, master's degree and doctorate")
+        self.assertEqual(normalize_abbreviations("bachelor"), "bachelor's degree")
+        self.assertEqual(normalize_abbreviations("jobs ms-word"), "jobs master's degree-word")
+
+if __name__ == '__main__':
+    unittest.main()
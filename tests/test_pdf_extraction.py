@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from unittest import mock
+from PyPDF2 import PageObject, PdfWriter
+from src.cleaner import extract_pdf, clean_text, process_document
+
+RESUME_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'resumes',
+                           'Resume - Allen Ho copy.docx.pdf')
+
+class TestPdfExtraction(unittest.TestCase):
+
+    def test_extracts_bundled_resume(self):
+        """Test that a bundled resume is extracted without errors"""
+        result = extract_pdf(RESUME_PATH)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(result['pages'], 1)
+        self.assertTrue(result['text'].strip())
+
+    def test_parallel_matches_sequential(self):
+        """Test that page-parallel extraction returns the same text"""
+        self.assertEqual(extract_pdf(RESUME_PATH, workers=2)['text'], extract_pdf(RESUME_PATH)['text'])
+
+    def test_character_cap(self):
+        """Test that extraction stops at max_chars and reports it"""
+        result = extract_pdf(RESUME_PATH, max_chars=100)
+        self.assertEqual(len(result['text']), 100)
+        self.assertIn("Truncated", result['errors'][-1]['error'])
+
+    def write_blank_pdf(self, directory, n_pages):
+        writer = PdfWriter()
+        for _ in range(n_pages):
+            writer.add_blank_page(width=200, height=200)
+        path = os.path.join(directory, 'long.pdf')
+        with open(path, 'wb') as f:
+            writer.write(f)
+        return path
+
+    def test_page_cap_reported_the_same_in_parallel(self):
+        """Test that an over-long PDF reports the same truncation with and without workers"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.write_blank_pdf(tmp, 5)
+            sequential = extract_pdf(path, max_pages=2)
+            parallel = extract_pdf(path, max_pages=2, workers=2)
+        self.assertEqual(sequential['errors'], [{'page': 2, 'error': "Truncated at 2 pages"}])
+        self.assertEqual(parallel['errors'], sequential['errors'])
+        self.assertEqual(parallel['pages'], sequential['pages'])
+
+    def test_pages_past_the_cap_are_not_extracted(self):
+        """Test that sequential extraction stops before the first page over max_pages"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.write_blank_pdf(tmp, 5)
+            with mock.patch.object(PageObject, 'extract_text', return_value="") as extract_text:
+                result = extract_pdf(path, max_pages=2)
+        self.assertEqual(extract_text.call_count, 2)
+        self.assertEqual(result['errors'], [{'page': 2, 'error': "Truncated at 2 pages"}])
+
+    def test_missing_file_returns_structured_error(self):
+        """Test that unreadable files produce an error entry instead of raising"""
+        result = extract_pdf('does-not-exist.pdf')
+        self.assertEqual(result['text'], '')
+        self.assertIsNone(result['errors'][0]['page'])
+
+    def test_streamed_cleaning_matches_whole_document(self):
+        """Test that cleaning page by page gives the same text as cleaning it all at once"""
+        self.assertEqual(process_document(RESUME_PATH), clean_text(extract_pdf(RESUME_PATH)['text']))
+
+if __name__ == '__main__':
+    unittest.main()
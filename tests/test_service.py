@@ -0,0 +1,135 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.service import IngestionService, serve, request
+from src.tokenizer import extract_cs_keywords
+
+# Dictionary lookup without NLTK, so the service can be exercised anywhere
+def split_keywords(payload):
+    return extract_cs_keywords(payload['text'].lower().split())
+
+class TestIngestionService(unittest.TestCase):
+
+    def start_service(self, **kwargs):
+        service = IngestionService(executor=ThreadPoolExecutor(2), processor=split_keywords, **kwargs)
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        server = {}
+
+        async def run():
+            started = asyncio.Event()
+            server['task'] = asyncio.create_task(serve(service, port=0, ready=started))
+            await started.wait()
+            ready.set()
+            try:
+                await server['task']
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=lambda: loop.run_until_complete(run()), daemon=True)
+        thread.start()
+        ready.wait(10)
+
+        def stop():
+            loop.call_soon_threadsafe(server['task'].cancel)
+            thread.join(10)
+            loop.close()
+        self.addCleanup(stop)
+        return service, loop, service.address[1]
+
+    def test_ingest_then_score(self):
+        """Test that posted resumes are processed and ranked against a job"""
+        service, loop, port = self.start_service()
+        resumes = {'a': "python machine learning tensorflow", 'b': "java spring backend",
+                   'c': "python flask backend"}
+        for resume_id, text in resumes.items():
+            status, body = request('127.0.0.1', port, 'POST', '/resumes', {'id': resume_id, 'text': text})
+            self.assertEqual(status, 202)
+        asyncio.run_coroutine_threadsafe(service.drain(), loop).result(10)
+        asyncio.run_coroutine_threadsafe(service.refresh(), loop).result(10)
+
+        self.assertEqual(request('127.0.0.1', port, 'GET', '/resumes/a')[1]['status'], 'ready')
+        status, body = request('127.0.0.1', port, 'POST', '/score', {'text': "python backend", 'k': 2})
+        self.assertEqual(status, 200)
+        self.assertEqual(body['pool_size'], 3)
+        self.assertEqual(body['matches'][0]['id'], 'c')
+        self.assertEqual(len(body['matches']), 2)
+
+        metrics = request('127.0.0.1', port, 'GET', '/metrics')[1]
+        self.assertEqual(metrics['routes']['POST /resumes']['count'], 3)
+        self.assertIn('p99_ms', metrics['routes']['POST /score'])
+
+    def test_scoring_does_not_refit(self):
+        """Test that ingests between refits are scored by the last background fit"""
+        service, loop, port = self.start_service(refit_interval=3600)
+        run = lambda coroutine: asyncio.run_coroutine_threadsafe(coroutine, loop).result(10)
+        for resume_id, text in [('a', "python backend"), ('b', "java backend")]:
+            request('127.0.0.1', port, 'POST', '/resumes', {'id': resume_id, 'text': text})
+        run(service.drain())
+        run(service.refresh())
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/score', {'text': "python"})[1]['pool_size'], 2)
+
+        request('127.0.0.1', port, 'POST', '/resumes', {'id': 'c', 'text': "python flask"})
+        run(service.drain())
+        fitted = service._matcher
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/score', {'text': "python"})[1]['pool_size'], 2)
+        self.assertIs(service._matcher, fitted)
+        self.assertEqual(request('127.0.0.1', port, 'GET', '/metrics')[1]['scored_pool_size'], 2)
+
+        run(service.refresh())
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/score', {'text': "python"})[1]['pool_size'], 3)
+
+    def test_full_queue_applies_backpressure(self):
+        """Test that a full ingestion queue is answered with 503 rather than buffered"""
+        service, loop, port = self.start_service(queue_size=1, workers=0)
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/resumes', {'id': 1, 'text': "python"})[0], 202)
+        status, body = request('127.0.0.1', port, 'POST', '/resumes', {'id': 2, 'text': "java"})
+        self.assertEqual(status, 503)
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/resumes', {'text': "no id"})[0], 400)
+
+    def test_invalid_content_length(self):
+        """Test that a malformed or negative Content-Length is a client error"""
+        service, loop, port = self.start_service()
+        for length in ['abc', '-5']:
+            with socket.create_connection(('127.0.0.1', port), timeout=10) as connection:
+                connection.sendall(f"POST /resumes HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                response = connection.makefile('rb').readline()
+            self.assertIn(b' 400 ', response, length)
+
+    def test_invalid_bodies_and_parameters(self):
+        """Test that non-object bodies and non-positive k or top_n are client errors"""
+        service, loop, port = self.start_service()
+        for body in [[], "x", 3]:
+            self.assertEqual(request('127.0.0.1', port, 'POST', '/score', body)[0], 400, body)
+            self.assertEqual(request('127.0.0.1', port, 'POST', '/resumes', body)[0], 400, body)
+        for field, value in [('k', -1), ('k', 0), ('top_n', -1), ('k', '5'), ('k', 2.5), ('k', True)]:
+            status, body = request('127.0.0.1', port, 'POST', '/score', {'text': "python", field: value})
+            self.assertEqual(status, 400, (field, value))
+            self.assertIn(field, body['error'])
+
+    def test_paths_outside_allowed_root_are_refused(self):
+        """Test that server-side paths need an allowed root and cannot escape it"""
+        service, loop, port = self.start_service()
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/resumes', {'id': 1, 'path': __file__})[0], 400)
+
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        with open(os.path.join(root.name, 'resume.txt'), 'w') as f:
+            f.write("python backend")
+        service.allowed_root = os.path.realpath(root.name)
+        for path in ['../' + os.path.basename(__file__), os.path.abspath(__file__), '/etc/passwd', 'missing.txt']:
+            status, body = request('127.0.0.1', port, 'POST', '/resumes', {'id': 2, 'path': path})
+            self.assertEqual(status, 400, path)
+            status, body = request('127.0.0.1', port, 'POST', '/score', {'path': path})
+            self.assertEqual(status, 400, path)
+        self.assertEqual(request('127.0.0.1', port, 'POST', '/resumes', {'id': 3, 'path': 'resume.txt'})[0], 202)
+
+if __name__ == '__main__':
+    unittest.main()
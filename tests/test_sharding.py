@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from src.similarity import JobMatcher
+from src.sharding import ShardedMatcher, LocalTransport, ProcessTransport
+from benchmarks.synthetic import generate_resumes, generate_jobs
+
+class TestShardedMatcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.resumes = generate_resumes(300, 60)
+        cls.jobs = generate_jobs(3)
+
+    def assert_same_as_single_process(self, sharded, max_features=None):
+        reference = JobMatcher(max_features=max_features).fit(self.resumes)
+        self.assertEqual(sharded.vocabulary, list(reference.feature_names))
+        np.testing.assert_array_equal(sharded.idf, reference.vectorizer.idf_)
+        np.testing.assert_array_equal(sharded.score(self.jobs), reference.score(self.jobs))
+        for job in self.jobs:
+            self.assertEqual(sharded.top_matches(job, k=10, top_n=5), reference.top_matches(job, k=10, top_n=5))
+
+    def test_local_shards_match_single_process(self):
+        """Test that merged shard rankings and scores equal one matcher over the whole pool"""
+        for n_shards, max_features in ((3, None), (5, 200)):
+            sharded = ShardedMatcher(n_shards, LocalTransport(), max_features=max_features).fit(self.resumes)
+            self.addCleanup(sharded.close)
+            self.assert_same_as_single_process(sharded, max_features)
+
+    def test_process_transport(self):
+        """Test shards living in separate worker processes"""
+        sharded = ShardedMatcher(2, ProcessTransport()).fit(self.resumes)
+        self.addCleanup(sharded.close)
+        self.assert_same_as_single_process(sharded)
+
+    def test_refit_keeps_settings(self):
+        """Test that fitting a JobMatcher twice uses the same max_features both times"""
+        matcher = JobMatcher(max_features=20)
+        first = list(matcher.fit(self.resumes).feature_names)
+        self.assertEqual(len(first), 20)
+        self.assertEqual(list(matcher.fit(self.resumes).feature_names), first)
+
+    def test_small_pool_and_unfitted(self):
+        """Test a pool smaller than the shard count, and scoring before fitting"""
+        with self.assertRaises(ValueError):
+            ShardedMatcher(2).top_matches(self.jobs[0])
+        sharded = ShardedMatcher(8).fit(self.resumes[:3])
+        self.addCleanup(sharded.close)
+        self.assertEqual(len(sharded.shard_ids), 3)
+        self.assertEqual(len(sharded.top_matches(self.jobs[0], k=5)), 3)
+
+    def test_non_positive_k_is_rejected(self):
+        """Test that top_matches refuses k <= 0 before calling any shard"""
+        sharded = ShardedMatcher(2).fit(self.resumes[:10])
+        self.addCleanup(sharded.close)
+        sharded.transport.submit = None  # any shard call would fail
+        for k in (0, -1):
+            with self.assertRaises(ValueError):
+                sharded.top_matches(self.jobs[0], k=k)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+from src import stemmer
+from src.stemmer import stem_with_mapping, stem_unique, save_stem_cache, load_stem_cache, clear_stem_cache
+
+class TestStemCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_stem_cache()
+
+    def test_most_common_form_is_representative(self):
+        """Test that counts pick the most frequent original form"""
+        tokens = ["development", "development", "development", "develop", "develop", "developer"]
+        stemmed, mapping = stem_with_mapping(tokens)
+        self.assertEqual(len(set(stemmed)), 1)
+        self.assertEqual(mapping[stemmed[0]], "development")
+
+    def test_cache_is_bounded(self):
+        """Test that the cache never grows past STEM_CACHE_SIZE"""
+        original_size = stemmer.STEM_CACHE_SIZE
+        stemmer.STEM_CACHE_SIZE = 5
+        try:
+            stems = stem_unique([f"token{i}s" for i in range(20)])
+            self.assertEqual(len(stems), 20)
+            self.assertLessEqual(len(stemmer._stem_cache), 5)
+        finally:
+            stemmer.STEM_CACHE_SIZE = original_size
+
+    def test_recently_used_stems_are_kept(self):
+        """Test that eviction drops the least recently used stems, not the oldest"""
+        original_size = stemmer.STEM_CACHE_SIZE
+        stemmer.STEM_CACHE_SIZE = 3
+        try:
+            stem_unique(["engineers"])
+            stem_unique(["developers"])
+            stem_unique(["engineers"])
+            stem_unique(["testers", "managers"])
+            self.assertIn("engineers", stemmer._stem_cache)
+            self.assertNotIn("developers", stemmer._stem_cache)
+        finally:
+            stemmer.STEM_CACHE_SIZE = original_size
+
+    def test_save_and_load(self):
+        """Test that a persisted cache is reloaded"""
+        stem_unique(["engineering", "engineers"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stems.json')
+            save_stem_cache(path)
+            clear_stem_cache()
+            self.assertEqual(load_stem_cache(path), 2)
+        self.assertEqual(stemmer._stem_cache["engineers"], "engin")
+
+if __name__ == '__main__':
+    unittest.main()
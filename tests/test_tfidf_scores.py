@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from src.tfidf_vectorizer import get_tfidf_scores, iter_tfidf_scores, get_top_tfidf_features
+
+class TestSparseTfidfScores(unittest.TestCase):
+
+    def setUp(self):
+        self.matrix = sp.random(20, 50, density=0.2, format='csr', random_state=0)
+        self.feature_names = [f"term{i}" for i in range(50)]
+
+    def dense_scores(self, doc_index):
+        row = self.matrix.toarray()[doc_index]
+        return {self.feature_names[i]: s for i, s in enumerate(row) if s > 0}
+
+    def test_scores_match_dense_extraction(self):
+        """Test that sparse rows give the same dicts, in the same order, as the dense path"""
+        for doc_index in range(self.matrix.shape[0]):
+            scores = get_tfidf_scores(self.matrix, self.feature_names, doc_index)
+            expected = self.dense_scores(doc_index)
+            self.assertEqual(list(scores.items()), list(expected.items()))
+
+    def test_iter_scores(self):
+        """Test that iterating yields one dict per document"""
+        all_scores = list(iter_tfidf_scores(self.matrix, self.feature_names))
+        self.assertEqual(len(all_scores), 20)
+        self.assertEqual(all_scores[3], self.dense_scores(3))
+
+    def test_top_features(self):
+        """Test that top-k features are the highest scores, descending"""
+        indices, scores = get_top_tfidf_features(self.matrix, 0, top_n=3)
+        expected = sorted(self.dense_scores(0).values(), reverse=True)[:3]
+        np.testing.assert_allclose(scores, expected)
+        self.assertEqual(len(indices), len(scores))
+
+if __name__ == '__main__':
+    unittest.main()